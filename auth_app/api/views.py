@@ -184,17 +184,13 @@ class BaseInfoView(APIView):
         }
 
     def _get_review_stats(self):
-        """Get review statistics."""
-        from reviews_app.models import Review
-        from django.db.models import Avg
-        
-        reviews = Review.objects.all()
-        review_count = reviews.count()
-        average_rating = reviews.aggregate(Avg('rating'))['rating__avg'] or 0.0
-        
+        """Get review statistics from the platform rating summary."""
+        from reviews_app.models import PlatformRatingSummary
+
+        summary = PlatformRatingSummary.get()
         return {
-            'review_count': review_count,
-            'average_rating': round(average_rating, 1)
+            'review_count': summary.count,
+            'average_rating': summary.average or 0.0
         }
 
 
@@ -206,18 +202,12 @@ class OrderCountView(APIView):
 
     def get(self, request, business_user_id):
         """Get count of in_progress orders for business user."""
-        from orders_app.models import Order
-        
-        try:
-            business_user = User.objects.get(id=business_user_id)
-            order_count = Order.objects.filter(
-                offer_detail__offer__owner=business_user,
-                status='in_progress'
-            ).count()
-            
-            return Response({'order_count': order_count})
-        except User.DoesNotExist:
+        from orders_app.models import BusinessOrderStats
+
+        order_count = BusinessOrderStats.get_count(business_user_id, 'in_progress')
+        if order_count is None:
             return Response({'detail': 'Business user not found.'}, status=status.HTTP_404_NOT_FOUND)
+        return Response({'order_count': order_count})
 
 
 class CompletedOrderCountView(APIView):
@@ -228,18 +218,13 @@ class CompletedOrderCountView(APIView):
 
     def get(self, request, business_user_id):
         """Get count of completed orders for business user."""
-        from orders_app.models import Order
-        
-        try:
-            business_user = User.objects.get(id=business_user_id)
-            completed_order_count = Order.objects.filter(
-                offer_detail__offer__owner=business_user,
-                status='completed'
-            ).count()
-            
-            return Response({'completed_order_count': completed_order_count})
-        except User.DoesNotExist:
+        from orders_app.models import BusinessOrderStats
+
+        completed_order_count = BusinessOrderStats.get_count(
+            business_user_id, 'completed')
+        if completed_order_count is None:
             return Response({'detail': 'Business user not found.'}, status=status.HTTP_404_NOT_FOUND)
+        return Response({'completed_order_count': completed_order_count})
 
 
 class HelloView(APIView):
@@ -271,7 +256,8 @@ class LogoutView(APIView):
             Response: Success message (200) or error (400)
         """
         try:
-            # Delete the user's token
+            # Delete the user's token, this also evicts it from the
+            # token cache (see core.signals)
             request.user.auth_token.delete()
             return Response({
                 'message': 'Successfully logged out.'
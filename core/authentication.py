@@ -1,8 +1,76 @@
-from rest_framework.authentication import TokenAuthentication
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import BasicAuthentication, TokenAuthentication
 from rest_framework import exceptions
+from . import credential_cache, token_cache
 
 
-class OptionalTokenAuthentication(TokenAuthentication):
+def get_profile_type(user):
+    """
+    Return the profile type of a user or None without a profile.
+
+    Users authenticated by token or basic auth have their profile attached,
+    so this does not query the database for them.
+    """
+    profile = getattr(user, token_cache.PROFILE_RELATION, None)
+    return None if profile is None else profile.type
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that caches valid tokens (see core.token_cache).
+
+    The token, its user and the user's profile are read with one joined
+    query, the profile is attached to the user so role checks on
+    ``request.user.profile`` need no further query. Repeat callers are
+    authenticated without a database query. Invalid tokens and inactive
+    users are not cached and fail as usual.
+    """
+
+    def authenticate_credentials(self, key):
+        """Return the cached (user, token) pair or look the token up."""
+        cached = token_cache.get_token(key)
+        if cached is not None:
+            return cached
+
+        model = self.get_model()
+        try:
+            token = (model.objects
+                     .select_related('user', f'user__{token_cache.PROFILE_RELATION}')
+                     .get(key=key))
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+
+        token_cache.set_token(token.user, token)
+        return token.user, token
+
+
+class CachedBasicAuthentication(BasicAuthentication):
+    """
+    Basic authentication that remembers verified credentials (see
+    core.credential_cache).
+
+    Repeat callers are authenticated with one query for the user and its
+    profile instead of running the password hasher on every request.
+    Wrong credentials are never cached and fail as usual.
+    """
+
+    def authenticate_credentials(self, userid, password, request=None):
+        """Return the user of cached credentials or check the password."""
+        queryset = get_user_model().objects.select_related(token_cache.PROFILE_RELATION)
+        user = credential_cache.get_user(userid, password, queryset)
+        if user is not None:
+            return user, None
+
+        user, auth = super().authenticate_credentials(userid, password, request)
+        credential_cache.set_user(userid, password, user)
+        return user, auth
+
+
+class OptionalTokenAuthentication(CachedTokenAuthentication):
     """
     Token authentication that doesn't fail for invalid tokens.
 
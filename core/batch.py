@@ -0,0 +1,62 @@
+"""
+Batch lookups of several objects by an ``?ids=1,2,3`` parameter.
+
+Batch endpoints return all requested objects with one ``IN`` query instead
+of one request per object. The number of ids per request is limited by
+``BATCH_LOOKUP_MAX_IDS``.
+"""
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+
+def get_max_ids():
+    """Return the maximum number of ids of one batch request."""
+    return getattr(settings, 'BATCH_LOOKUP_MAX_IDS', 50)
+
+
+def parse_id_list(value, param='ids'):
+    """
+    Parse a comma separated list of positive integer ids.
+
+    Duplicates are dropped, the order of the first occurrences is kept.
+    Raises ValidationError for missing, malformed or too many ids.
+    """
+    parts = [part.strip() for part in (value or '').split(',') if part.strip()]
+    if not parts:
+        raise ValidationError({param: 'Provide a comma separated list of ids.'})
+    try:
+        ids = list(dict.fromkeys(int(part) for part in parts))
+    except ValueError:
+        raise ValidationError({param: 'All ids must be integers.'})
+    if any(pk <= 0 for pk in ids):
+        raise ValidationError({param: 'All ids must be positive integers.'})
+    max_ids = get_max_ids()
+    if len(ids) > max_ids:
+        raise ValidationError(
+            {param: f'At most {max_ids} ids can be requested at once.'})
+    return ids
+
+
+class BatchLookupMixin:
+    """
+    View mixin returning the objects whose ``batch_lookup_field`` is in ``?ids=``.
+
+    The objects are returned as a list in the order of the requested ids,
+    ids without a matching object are left out.
+    """
+    batch_lookup_field = 'pk'
+    batch_query_param = 'ids'
+
+    def get(self, request, *args, **kwargs):
+        """Return the requested objects."""
+        ids = parse_id_list(
+            request.query_params.get(self.batch_query_param),
+            self.batch_query_param)
+        objects = self.get_queryset().filter(
+            **{f'{self.batch_lookup_field}__in': ids})
+        by_id = {
+            getattr(obj, self.batch_lookup_field): obj for obj in objects}
+        found = [by_id[pk] for pk in ids if pk in by_id]
+        serializer = self.get_serializer(found, many=True)
+        return Response(serializer.data)
@@ -0,0 +1,63 @@
+"""
+Conditional GET support for detail endpoints.
+
+The validators of a response are derived from the ``updated_at`` columns
+of the object and of the related rows it embeds, read with one aggregate
+query. Requests whose If-None-Match or If-Modified-Since header still
+matches are answered with 304 before the object is loaded or serialized.
+"""
+import hashlib
+
+from django.db.models import Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalGetMixin:
+    """
+    View mixin adding ETag and Last-Modified handling to GET requests.
+
+    ``last_modified_fields`` lists the timestamp columns (may span
+    relations) whose newest value marks the last change of the response.
+    Views restrict ``get_validator_queryset`` to the rows the user may read,
+    requests for other rows fall through to the regular response (404/403).
+    """
+    last_modified_fields = ('updated_at',)
+
+    def get(self, request, *args, **kwargs):
+        """Return 304 for unchanged objects, otherwise the full response."""
+        last_modified = self.get_last_modified()
+        if last_modified is None:
+            return super().get(request, *args, **kwargs)
+
+        etag = self.get_etag(last_modified)
+        timestamp = int(last_modified.timestamp())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(timestamp)
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def get_validator_queryset(self):
+        """Return a queryset containing only the requested object."""
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return self.get_queryset().model._default_manager.filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+
+    def get_last_modified(self):
+        """Return the newest timestamp of the requested object or None."""
+        values = self.get_validator_queryset().order_by().aggregate(**{
+            f'value_{index}': Max(field)
+            for index, field in enumerate(self.last_modified_fields)})
+        timestamps = [value for value in values.values() if value is not None]
+        return max(timestamps) if timestamps else None
+
+    def get_etag(self, last_modified):
+        """Build the ETag from the object identity and its timestamp."""
+        identity = (f'{self.get_queryset().model._meta.label}:'
+                    f'{self.kwargs}:{last_modified.isoformat()}')
+        return quote_etag(hashlib.md5(identity.encode('utf-8')).hexdigest())
@@ -0,0 +1,61 @@
+"""
+Cache of verified Basic auth credentials for CachedBasicAuthentication.
+
+Checking a password runs the password hasher (PBKDF2 by default), which
+costs far more CPU than the rest of a request. After a successful check
+the (username, password) pair is remembered for ``BASIC_AUTH_CACHE_TTL``
+seconds. The cache key is a keyed HMAC of the pair, so neither the
+password nor an unkeyed hash of it is stored.
+
+An entry holds the user id and a fingerprint of the user's password hash.
+Hits reload the user and compare the fingerprint, so changing the password
+or deactivating the user takes effect at once without signals.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+KEY_PREFIX = 'auth-basic:'
+KEY_SALT = 'core.credential_cache'
+
+
+def get_ttl():
+    """Return the lifetime of cache entries in seconds."""
+    return getattr(settings, 'BASIC_AUTH_CACHE_TTL', 60)
+
+
+def get_cache_key(username, password):
+    """Return the cache key of a username and password pair."""
+    # Basic auth user ids cannot contain a colon, the join is unambiguous
+    value = f'{username}:{password}'
+    return KEY_PREFIX + salted_hmac(KEY_SALT, value, algorithm='sha256').hexdigest()
+
+
+def get_password_fingerprint(user):
+    """Return a keyed fingerprint of the user's current password hash."""
+    return salted_hmac(
+        KEY_SALT + '.password', user.password, algorithm='sha256').hexdigest()
+
+
+def get_user(username, password, queryset):
+    """
+    Return the active user of verified credentials or None.
+
+    None means the credentials have to be checked with the password
+    hasher, either because they are not cached or because the password
+    changed or the user was deactivated since.
+    """
+    entry = cache.get(get_cache_key(username, password))
+    if entry is None:
+        return None
+    user = queryset.filter(pk=entry['user_id']).first()
+    if (user is None or not user.is_active or not constant_time_compare(
+            entry['password'], get_password_fingerprint(user))):
+        return None
+    return user
+
+
+def set_user(username, password, user):
+    """Remember that the credentials were verified for a user."""
+    entry = {'user_id': user.pk, 'password': get_password_fingerprint(user)}
+    cache.set(get_cache_key(username, password), entry, get_ttl())
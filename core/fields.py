@@ -0,0 +1,44 @@
+"""
+Serializer fields shared by the apps.
+"""
+from rest_framework import serializers
+from rest_framework.fields import SkipField
+from .uploads import ingest_data_uri, ingest_uploaded_file
+
+
+class Base64OrFileImageField(serializers.Field):
+    """
+    Custom field that accepts either a base64 string or a file upload.
+
+    Both are checked against the configured size and dimension limits
+    without loading the whole image into memory (see core.uploads).
+    """
+
+    def __init__(self, *args, filename='offer_image', **kwargs):
+        self.filename = filename
+        super().__init__(*args, **kwargs)
+
+    def to_internal_value(self, data):
+        """Process image data from various formats."""
+        # Handle file upload (from FormData)
+        if hasattr(data, 'read'):
+            return ingest_uploaded_file(data)
+
+        # Handle base64 string
+        if isinstance(data, str) and data.startswith('data:image'):
+            return ingest_data_uri(data, self.filename)
+
+        return self._handle_empty_or_invalid_data(data)
+
+    def _handle_empty_or_invalid_data(self, data):
+        """Handle empty or invalid image data."""
+        if not data:
+            # Empty values leave the current image untouched
+            raise SkipField()
+
+        raise serializers.ValidationError(
+            "Invalid image format. Expected file or base64 string.")
+
+    def to_representation(self, value):
+        """Return representation of the object."""
+        return None  # We don't need to return the image data
@@ -0,0 +1,109 @@
+"""
+Idempotency-Key support for create endpoints.
+
+A client may send an ``Idempotency-Key`` header with a POST request. The
+first request with a key reserves it, runs normally and stores its
+response. Retries with the same key and the same body replay the stored
+response without validating or inserting anything again. Keys expire after
+``IDEMPOTENCY_KEY_TTL`` seconds, expired keys are removed by the
+``purge_idempotency_keys`` command.
+"""
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from .models import IdempotencyKey
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+def get_ttl():
+    """Return the lifetime of stored keys in seconds."""
+    return getattr(settings, 'IDEMPOTENCY_KEY_TTL', 24 * 60 * 60)
+
+
+def get_request_hash(request):
+    """Return a fingerprint of the request method, path and body."""
+    body = JSONRenderer().render(request.data) if request.data else b''
+    raw = b'|'.join([request.method.encode(), request.path.encode(), body])
+    return hashlib.sha256(raw).hexdigest()
+
+
+class IdempotentCreateMixin:
+    """
+    View mixin honoring the Idempotency-Key header on POST requests.
+
+    It wraps ``post`` so that views can keep overriding ``create``.
+
+    Only successful responses are stored. Requests that fail (validation
+    or permission errors) release the key, so the client can retry them
+    with the same key after fixing the request.
+    """
+    # Name of the endpoint, keys are unique per user and scope
+    idempotency_scope = None
+
+    def post(self, request, *args, **kwargs):
+        """Create the object once per idempotency key."""
+        key = request.headers.get(HEADER)
+        if not key or not request.user.is_authenticated:
+            return super().post(request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {'detail': f'{HEADER} must be at most {MAX_KEY_LENGTH} characters.'},
+                status=status.HTTP_400_BAD_REQUEST)
+
+        request_hash = get_request_hash(request)
+        record, created = self._reserve_key(request.user, key, request_hash)
+        if not created:
+            return self._replay(record, request_hash)
+
+        try:
+            response = super().post(request, *args, **kwargs)
+        except Exception:
+            record.delete()
+            raise
+        if not status.is_success(response.status_code):
+            record.delete()
+            return response
+
+        record.response_status = response.status_code
+        # Stored as rendered JSON so replays are identical to the original
+        record.response_body = json.loads(JSONRenderer().render(response.data))
+        record.save(update_fields=['response_status', 'response_body'])
+        return response
+
+    def _reserve_key(self, user, key, request_hash):
+        """Insert the key or return the existing record for it."""
+        lookup = {'user': user, 'key': key, 'scope': self.idempotency_scope}
+        IdempotencyKey.objects.filter(
+            expires_at__lte=timezone.now(), **lookup).delete()
+        try:
+            with transaction.atomic():
+                return IdempotencyKey.objects.create(
+                    request_hash=request_hash,
+                    expires_at=timezone.now() + timedelta(seconds=get_ttl()),
+                    **lookup), True
+        except IntegrityError:
+            return IdempotencyKey.objects.filter(**lookup).first(), False
+
+    def _replay(self, record, request_hash):
+        """Return the stored response of a key."""
+        if record is not None and record.request_hash != request_hash:
+            return Response(
+                {'detail': f'{HEADER} was already used for a different request.'},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+        if record is None or record.response_status is None:
+            return Response(
+                {'detail': f'A request with this {HEADER} is still being processed.'},
+                status=status.HTTP_409_CONFLICT)
+        return Response(
+            record.response_body,
+            status=record.response_status,
+            headers={'Idempotent-Replayed': 'true'})
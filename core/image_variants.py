@@ -0,0 +1,240 @@
+"""
+Thumbnails and WebP variants of uploaded offer and profile images.
+
+For every configured width (``IMAGE_VARIANT_WIDTHS``) an image is resized
+into two variants next to the original, below a ``variants/`` directory:
+
+- ``<name>_w<width>.webp``
+- ``<name>_w<width>.jpg`` (``.png`` for PNG and GIF originals)
+
+Variants are generated after the upload has been committed, in a local
+worker process so the request cycle is not blocked. Set
+``IMAGE_VARIANTS_ASYNC = False`` to generate them inline instead.
+``handle_saved_image`` and ``handle_deleted_image`` connect this to the
+models: variants are generated when an image is uploaded and removed when
+it is replaced, cleared or its row is deleted.
+
+Models with variants have a ``variants_ready`` column. It is cleared by
+``clear_variants_ready`` when the image changes and set by the callback
+passed to ``schedule_variants``, so serializing a row never asks the
+storage whether its variants exist.
+"""
+import logging
+import posixpath
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+VARIANT_DIR = 'variants'
+WEBP_QUALITY = 80
+JPEG_QUALITY = 85
+
+_executor = None
+
+
+def get_widths():
+    """Return the configured variant widths in ascending order."""
+    return sorted(getattr(settings, 'IMAGE_VARIANT_WIDTHS', (160, 320, 640)))
+
+
+def get_variant_names(name, width):
+    """Return the storage names of the variants of ``name`` for a width."""
+    directory, filename = posixpath.split(name)
+    stem, ext = posixpath.splitext(filename)
+    base = posixpath.join(directory, VARIANT_DIR, f'{stem}_w{width}')
+    fallback_ext = '.png' if ext.lower() in ('.png', '.gif') else '.jpg'
+    return {'webp': base + '.webp', 'fallback': base + fallback_ext}
+
+
+def get_variant_urls(instance, request=None):
+    """
+    Return the URLs of the generated variants of the image of ``instance``.
+
+    The result maps each width to its ``webp`` and ``fallback`` URL and is
+    empty while ``instance.variants_ready`` is not set.
+    """
+    file = instance.file
+    if not file or not instance.variants_ready:
+        return {}
+    urls = {}
+    for width in get_widths():
+        names = get_variant_names(file.name, width)
+        urls[str(width)] = {
+            kind: _absolute_url(default_storage.url(path), request)
+            for kind, path in names.items()}
+    return urls
+
+
+def _absolute_url(url, request):
+    """Build an absolute URL if a request is available."""
+    return request.build_absolute_uri(url) if request else url
+
+
+def generate_variants(name, force=False):
+    """
+    Generate all variants of the stored image ``name``.
+
+    Existing variants are kept unless ``force`` is set. Returns True if
+    variants were written.
+    """
+    widths = get_widths()
+    if not force and default_storage.exists(get_variant_names(name, widths[-1])['webp']):
+        return False
+
+    with default_storage.open(name, 'rb') as fileobj:
+        with Image.open(fileobj) as original:
+            original = ImageOps.exif_transpose(original)
+            original.load()
+
+    for width in widths:
+        names = get_variant_names(name, width)
+        image = original.copy()
+        image.thumbnail((width, width * 10))
+        has_alpha = names['fallback'].endswith('.png')
+        _save(image, names['fallback'], 'PNG' if has_alpha else 'JPEG')
+        _save(image, names['webp'], 'WEBP')
+    return True
+
+
+def _save(image, name, image_format):
+    """Encode an image and write it to storage, replacing an old file."""
+    if image_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    elif image_format in ('PNG', 'WEBP') and image.mode == 'P':
+        image = image.convert('RGBA')
+    content = ContentFile(b'')
+    options = {'JPEG': {'quality': JPEG_QUALITY, 'optimize': True},
+               'WEBP': {'quality': WEBP_QUALITY},
+               'PNG': {'optimize': True}}[image_format]
+    image.save(content, image_format, **options)
+    if default_storage.exists(name):
+        default_storage.delete(name)
+    default_storage.save(name, content)
+
+
+def delete_variants(name):
+    """Remove all variants of the stored image ``name``."""
+    for width in get_widths():
+        for path in get_variant_names(name, width).values():
+            if default_storage.exists(path):
+                default_storage.delete(path)
+
+
+def clear_variants_ready(instance, update_fields=None):
+    """
+    Clear ``variants_ready`` before ``instance`` is saved with a new image.
+
+    Called from ``save()`` with its ``update_fields``, returns them with
+    ``variants_ready`` added if it was cleared.
+    """
+    if update_fields is not None and 'file' not in update_fields:
+        return update_fields
+    current = instance.file.name if instance.file else ''
+    if current == (instance._loaded_file or ''):
+        return update_fields
+    instance.variants_ready = False
+    if update_fields is not None:
+        update_fields = {*update_fields, 'variants_ready'}
+    return update_fields
+
+
+def handle_saved_image(instance, update_fields=None, on_done=None):
+    """
+    Update the variants after ``instance`` was saved.
+
+    The model records the image name it was loaded with in
+    ``_loaded_file``. Saves that keep the image do nothing, a new image
+    gets its variants once the transaction is committed and the variants
+    of a replaced or cleared image are removed. ``on_done`` is passed on
+    to ``schedule_variants``.
+    """
+    if update_fields is not None and 'file' not in update_fields:
+        return
+    previous = instance._loaded_file
+    current = instance.file.name if instance.file else ''
+    instance._loaded_file = current
+    if previous == current:
+        return
+    if previous:
+        transaction.on_commit(lambda: schedule_delete(previous))
+    if current:
+        transaction.on_commit(lambda: schedule_variants(current, on_done=on_done))
+
+
+def handle_deleted_image(instance):
+    """Remove the variants of a deleted row's image after the commit."""
+    if instance.file:
+        name = instance.file.name
+        transaction.on_commit(lambda: schedule_delete(name))
+
+
+def schedule_delete(name):
+    """Remove the variants of ``name`` outside the request cycle."""
+    if not getattr(settings, 'IMAGE_VARIANTS_ASYNC', True):
+        delete_variants(name)
+        return
+    future = _get_executor().submit(delete_variants, name)
+    future.add_done_callback(lambda f: _finish(f, name, None))
+
+
+def schedule_variants(name, on_done=None):
+    """
+    Generate the variants of ``name`` outside the request cycle.
+
+    ``on_done`` is called in the current process once the variants exist,
+    whether they were written or already there, to set ``variants_ready``
+    and invalidate cached responses that list the variants.
+    """
+    if not getattr(settings, 'IMAGE_VARIANTS_ASYNC', True):
+        _run_inline(name, on_done)
+        return
+    future = _get_executor().submit(generate_variants, name)
+    future.add_done_callback(lambda f: _finish(f, name, on_done))
+
+
+def _run_inline(name, on_done):
+    """Generate variants in the current process."""
+    try:
+        generate_variants(name)
+    except Exception:
+        logger.exception('Generating image variants for %s failed', name)
+        return
+    if on_done:
+        on_done()
+
+
+def _finish(future, name, on_done):
+    """Log failures of a background job and run its callback."""
+    try:
+        future.result()
+    except Exception:
+        logger.exception('Generating image variants for %s failed', name)
+        return
+    if on_done:
+        try:
+            on_done()
+        finally:
+            # Callbacks run in the executor's thread, do not leak connections
+            connections.close_all()
+
+
+def _get_executor():
+    """Return the worker process pool, starting it on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=getattr(settings, 'IMAGE_VARIANT_WORKERS', 1),
+            initializer=_init_worker)
+    return _executor
+
+
+def _init_worker():
+    """Set up Django in the worker process so storage can be used."""
+    import django
+    django.setup()
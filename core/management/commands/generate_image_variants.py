@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from core.image_variants import generate_variants
+from offers_app.cache import bump_catalog_version
+from offers_app.models import Offer
+from profiles_app.models import Profile
+
+
+class Command(BaseCommand):
+    """
+    Generate thumbnails and WebP variants of existing offer and profile images.
+
+    Images that already have variants are skipped unless --force is given.
+    The variants are generated in this process, one image after another.
+    Rows whose variants exist afterwards are marked ``variants_ready``,
+    rows that change get a new ``updated_at`` so cached responses without
+    the variants are revalidated.
+    """
+    help = 'Backfill the resized variants of offer and profile images.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Regenerate variants that already exist.')
+
+    def handle(self, *args, **options):
+        names = set()
+        for model in (Offer, Profile):
+            names.update(model.objects.exclude(file='').exclude(file__isnull=True)
+                         .values_list('file', flat=True))
+
+        generated, skipped, failed = [], [], 0
+        for name in sorted(names):
+            try:
+                if generate_variants(name, force=options['force']):
+                    generated.append(name)
+                else:
+                    skipped.append(name)
+            except Exception as error:
+                failed += 1
+                self.stderr.write(f'{name}: {error}')
+
+        now = timezone.now()
+        changed = self.mark_ready(generated, now, changed_only=False)
+        changed += self.mark_ready(skipped, now, changed_only=True)
+        if changed:
+            bump_catalog_version()
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated variants for {len(generated)} images, '
+            f'skipped {len(skipped)}, failed {failed}.'))
+
+    def mark_ready(self, names, now, changed_only):
+        """
+        Mark the rows of ``names`` as having variants, return the row count.
+
+        With ``changed_only`` rows that are already marked are left alone.
+        """
+        updated = 0
+        for start in range(0, len(names), 500):
+            chunk = names[start:start + 500]
+            for model in (Offer, Profile):
+                rows = model.objects.filter(file__in=chunk)
+                if changed_only:
+                    rows = rows.filter(variants_ready=False)
+                updated += rows.update(variants_ready=True, updated_at=now)
+        return updated
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from core.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    """
+    Delete expired Idempotency-Key records.
+
+    Expired keys are ignored by the API already, the command only keeps the
+    table small. Run it periodically, e.g. once a day from cron.
+    """
+    help = 'Delete expired idempotency keys.'
+
+    def handle(self, *args, **options):
+        deleted, _ = IdempotencyKey.objects.filter(
+            expires_at__lte=timezone.now()).delete()
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {deleted} expired idempotency keys.'))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from core import token_cache
+
+
+class Command(BaseCommand):
+    """
+    Show the hit/miss counters of the token authentication cache.
+    """
+    help = 'Show (and optionally reset) the token authentication cache counters.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Reset the counters after printing them.')
+
+    def handle(self, *args, **options):
+        stats = token_cache.get_stats()
+        local_hits = stats[token_cache.LOCAL_HIT_COUNTER]
+        shared_hits = stats[token_cache.SHARED_HIT_COUNTER]
+        misses = stats[token_cache.MISS_COUNTER]
+        total = local_hits + shared_hits + misses
+        hit_rate = ((local_hits + shared_hits) / total * 100) if total else 0.0
+        self.stdout.write(f'Local hits:  {local_hits}')
+        self.stdout.write(f'Shared hits: {shared_hits}')
+        self.stdout.write(f'Misses:      {misses}')
+        self.stdout.write(f'Hit rate:    {hit_rate:.1f}%')
+        if options['reset']:
+            token_cache.reset_stats()
+            self.stdout.write(self.style.SUCCESS('Counters reset.'))
@@ -0,0 +1,32 @@
+"""
+Simple counters stored in the default cache backend.
+
+The counters are shared by all processes that use the same cache and are
+meant for rough hit/miss statistics, not for exact accounting.
+"""
+from django.core.cache import cache
+
+KEY_PREFIX = 'metrics:'
+
+
+def increment(name, delta=1):
+    """Increase the counter ``name`` by ``delta``."""
+    key = KEY_PREFIX + name
+    if cache.add(key, delta, None):
+        return
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        # The counter was evicted between add() and incr()
+        cache.set(key, delta, None)
+
+
+def get_counters(*names):
+    """Return a dict with the current value of each counter."""
+    values = cache.get_many([KEY_PREFIX + name for name in names])
+    return {name: values.get(KEY_PREFIX + name, 0) for name in names}
+
+
+def reset_counters(*names):
+    """Set the given counters back to zero."""
+    cache.delete_many([KEY_PREFIX + name for name in names])
@@ -0,0 +1,36 @@
+from django.db import models
+from django.contrib.auth.models import User
+
+
+class IdempotencyKey(models.Model):
+    """
+    Stored response of a create request sent with an Idempotency-Key header.
+
+    Retries with the same key replay the stored response instead of running
+    the request again. ``response_status`` is empty while the first request
+    is still being processed.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='idempotency_keys')
+    key = models.CharField(max_length=255)
+    # Endpoint the key was used for, keys are only unique per endpoint
+    scope = models.CharField(max_length=100)
+    request_hash = models.CharField(max_length=64)
+    response_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = 'core_idempotencykey'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'key', 'scope'],
+                name='core_idempotency_key_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.scope}: {self.key} ({self.user_id})"
@@ -0,0 +1,336 @@
+import base64
+import binascii
+import datetime
+import decimal
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination that seeks on the values of the ordering columns.
+
+    Instead of an OFFSET, every page is selected with a WHERE clause on the
+    position of the last row of the previous page, so deep pages cost the
+    same as the first one. The primary key is always appended to the
+    ordering as a unique tiebreak, which keeps pages stable for columns with
+    duplicate values. NULL values are sorted last in both directions.
+
+    No total count is calculated. Clients that need one can pass
+    ``?count=1`` to get a count that is cached for a short time.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    ordering_query_param = 'ordering'
+    count_query_param = 'count'
+    page_size = 10
+    max_page_size = 100
+    # Allowed values of the ordering parameter, the first one is the default
+    orderings = ('-created_at',)
+    count_cache_timeout = 60
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return one page of the queryset, seeking past the cursor position."""
+        position, reverse = self._start(request, queryset.model)
+        if self._count_requested(request):
+            self.count = self.get_cached_count(queryset)
+        results = self._fetch(queryset, position, reverse)
+        return self._finish(results, position, reverse)
+
+    def paginate_union(self, querysets, request, view=None):
+        """
+        Return one page of the union of several disjoint querysets.
+
+        Every queryset is seeked, ordered and limited on its own, so each
+        one can use an index on its filter and ordering columns, instead
+        of one query with an OR that has to sort all matching rows. The
+        page is then merged from the at most ``page_size + 1`` rows of
+        each queryset.
+        """
+        position, reverse = self._start(request, querysets[0].model)
+        if self._count_requested(request):
+            self.count = sum(self.get_cached_count(qs) for qs in querysets)
+        rows = {}
+        for queryset in querysets:
+            for row in self._fetch(queryset, position, reverse):
+                rows.setdefault(self._get_value(row, 'pk'), row)
+        results = self._sort(list(rows.values()), reverse)
+        return self._finish(results[:self.page_size + 1], position, reverse)
+
+    def _start(self, request, model):
+        """Read the pagination parameters, return the cursor position."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request)
+        self.fields = self.get_ordering_fields(self.ordering)
+        self.nullable = self._get_nullable_fields(model)
+        self.count = None
+        return self.decode_cursor(request)
+
+    def _fetch(self, queryset, position, reverse):
+        """Return the rows after the position plus one look-ahead row."""
+        if position is not None:
+            try:
+                queryset = queryset.filter(
+                    self.get_seek_filter(position, reverse))
+            except (TypeError, ValueError, DjangoValidationError):
+                raise NotFound(self.invalid_cursor_message)
+        queryset = queryset.order_by(*self.get_order_by(reverse))
+        return list(queryset[:self.page_size + 1])
+
+    def _sort(self, rows, reverse):
+        """Sort rows like get_order_by() does in the database."""
+        for name, descending in reversed(self.fields):
+            descending = descending != reverse
+            # Same placement of NULLs as in get_order_by()
+            null_flag = 1 if (not reverse) != descending else -1
+            rows.sort(
+                key=lambda row, name=name: self._sort_key(row, name, null_flag),
+                reverse=descending)
+        return rows
+
+    def _sort_key(self, row, name, null_flag):
+        """Sort key of one column that orders NULLs by ``null_flag``."""
+        value = self._get_value(row, name)
+        return (null_flag, 0) if value is None else (0, value)
+
+    def _finish(self, results, position, reverse):
+        """Trim the look-ahead row and remember the page for the links."""
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        """Return the page with links to the neighbouring pages."""
+        payload = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.count is not None:
+            payload = {'count': self.count, **payload}
+        return Response(payload)
+
+    def get_page_size(self, request):
+        """Get page size from request."""
+        page_size = request.query_params.get(self.page_size_query_param)
+        if page_size:
+            try:
+                page_size = int(page_size)
+                if page_size > 0:
+                    return min(page_size, self.max_page_size)
+            except ValueError:
+                pass
+        return self.page_size
+
+    def get_ordering(self, request):
+        """Return the requested ordering or the default one."""
+        ordering = request.query_params.get(self.ordering_query_param)
+        if ordering in self.orderings:
+            return ordering
+        return self.orderings[0]
+
+    def get_ordering_fields(self, ordering):
+        """
+        Return the ordering as a list of (field name, descending) pairs.
+
+        The primary key is appended in the direction of the ordering.
+        """
+        descending = ordering.startswith('-')
+        return [(ordering.lstrip('-'), descending), ('pk', descending)]
+
+    def get_order_by(self, reverse=False):
+        """Return the order_by() expressions for the given direction."""
+        expressions = []
+        # NULLs are last in reading direction, so first when walking back
+        nulls = {'nulls_first': True} if reverse else {'nulls_last': True}
+        for name, descending in self.fields:
+            expression = F(name).desc if descending != reverse else F(name).asc
+            if name in self.nullable:
+                expressions.append(expression(**nulls))
+            else:
+                expressions.append(expression())
+        return expressions
+
+    def get_seek_filter(self, position, reverse=False):
+        """
+        Build the WHERE clause selecting rows after (or before) a position.
+
+        The clause is the usual lexicographic comparison
+        ``(a > x) OR (a = x AND b > y) OR ...`` with NULL aware terms for
+        nullable columns.
+        """
+        seek = Q()
+        equal = Q()
+        for (name, descending), value in zip(self.fields, position):
+            step = self._step_filter(name, value, descending, reverse)
+            if step is not None:
+                seek |= equal & step
+            if value is None:
+                equal &= Q(**{f'{name}__isnull': True})
+            else:
+                equal &= Q(**{name: value})
+        return seek
+
+    def _step_filter(self, name, value, descending, reverse):
+        """Return the filter for rows strictly past ``value`` in one column."""
+        nullable = name in self.nullable
+        if value is None:
+            # NULLs are last, so only non NULL rows come before them
+            return Q(**{f'{name}__isnull': False}) if reverse else None
+        lookup = 'lt' if descending != reverse else 'gt'
+        step = Q(**{f'{name}__{lookup}': value})
+        if nullable and not reverse:
+            step |= Q(**{f'{name}__isnull': True})
+        return step
+
+    def get_cursor_after(self, item, ordering=None):
+        """
+        Return the cursor of the page following ``item``.
+
+        Lets other endpoints link into a paginated list, e.g. after
+        embedding its first rows. ``ordering`` defaults to the first one.
+        """
+        self.ordering = ordering or self.orderings[0]
+        self.fields = self.get_ordering_fields(self.ordering)
+        return self.encode_cursor(self.get_position(item))
+
+    def get_position(self, item):
+        """Return the values of the ordering columns for a result row."""
+        return [self._get_value(item, name) for name, _ in self.fields]
+
+    def _get_value(self, item, name):
+        """Read a column value from a model instance or a dict."""
+        if isinstance(item, dict):
+            return item['id'] if name == 'pk' else item[name]
+        return getattr(item, name)
+
+    def get_next_link(self):
+        """Return the link to the next page or None."""
+        if not self.has_next or not self.page:
+            return None
+        return self._build_link(self.get_position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        """Return the link to the previous page or None."""
+        if not self.has_previous or not self.page:
+            return None
+        return self._build_link(self.get_position(self.page[0]), reverse=True)
+
+    def _build_link(self, position, reverse):
+        """Build an absolute URL for a cursor position."""
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, 'page')
+        return replace_query_param(
+            url, self.cursor_query_param,
+            self.encode_cursor(position, reverse))
+
+    def encode_cursor(self, position, reverse=False):
+        """Encode a position into an opaque cursor string."""
+        payload = {
+            'o': self.ordering,
+            'v': [self._encode_value(value) for value in position],
+        }
+        if reverse:
+            payload['r'] = 1
+        data = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, request):
+        """
+        Decode the cursor of the request.
+
+        Returns a (position, reverse) pair, the position is None for the
+        first page. Raises NotFound for malformed cursors.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            padding = '=' * (-len(encoded) % 4)
+            payload = json.loads(
+                base64.urlsafe_b64decode(encoded + padding).decode('utf-8'))
+            position = payload['v']
+            ordering = payload['o']
+            reverse = bool(payload.get('r'))
+        except (TypeError, ValueError, KeyError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if ordering != self.ordering or not isinstance(position, list) \
+                or len(position) != len(self.fields):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def _encode_value(self, value):
+        """Convert a column value into a JSON compatible value."""
+        if isinstance(value, (datetime.datetime, datetime.date)):
+            return value.isoformat()
+        if isinstance(value, decimal.Decimal):
+            return str(value)
+        return value
+
+    def _get_nullable_fields(self, model):
+        """Return the names of the ordering columns that allow NULL."""
+        nullable = set()
+        for name, _ in self.fields:
+            if name != 'pk' and model._meta.get_field(name).null:
+                nullable.add(name)
+        return nullable
+
+    def _count_requested(self, request):
+        """Check whether the client asked for a total count."""
+        value = request.query_params.get(self.count_query_param, '')
+        return value.lower() in ('1', 'true', 'yes')
+
+    def get_cached_count(self, queryset):
+        """Return the number of rows of the queryset, cached briefly."""
+        sql, params = queryset.order_by().values('pk').query.sql_with_params()
+        digest = hashlib.md5(
+            f'{sql}|{params!r}'.encode('utf-8')).hexdigest()
+        key = f'keyset-count:{digest}'
+        count = cache.get(key)
+        if count is None:
+            count = queryset.order_by().count()
+            cache.set(key, count, self.count_cache_timeout)
+        return count
+
+
+class CursorPaginationMixin:
+    """
+    View mixin that switches to keyset pagination on request.
+
+    When the request contains the cursor parameter (``?cursor=`` starts at
+    the first page) ``cursor_pagination_class`` is used, otherwise the
+    view's regular ``pagination_class``.
+    """
+    cursor_pagination_class = KeysetPagination
+
+    @property
+    def paginator(self):
+        """The paginator instance associated with the view, or None."""
+        if not hasattr(self, '_paginator'):
+            cursor_param = self.cursor_pagination_class.cursor_query_param
+            if cursor_param in self.request.query_params:
+                self._paginator = self.cursor_pagination_class()
+            elif self.pagination_class is None:
+                self._paginator = None
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
@@ -0,0 +1,123 @@
+"""
+Sparse fieldsets for list endpoints.
+
+Clients pass ``?fields=id,username`` to receive only the named fields of
+every object. Fields that are not requested are removed from the
+serializer before serialization, so their values (and method fields) are
+never computed. The queryset is limited with ``only()`` to the columns the
+requested fields read and joins only the relations they need.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+
+FIELDS_QUERY_PARAM = 'fields'
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    Serializer mixin accepting a ``fields`` argument.
+
+    Only the fields listed in ``fields`` are serialized, None keeps all.
+    ``Meta.sparse_field_sources`` maps fields whose source is not a model
+    field (method fields) to the model field paths they read.
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    def get_source_paths(self, fields):
+        """
+        Return the model field paths read by ``fields`` or None.
+
+        None means some field reads the whole object, so the queryset
+        cannot be limited.
+        """
+        sources = getattr(self.Meta, 'sparse_field_sources', {})
+        paths = []
+        for name in fields:
+            if name in sources:
+                paths.extend(sources[name])
+                continue
+            source = self.fields[name].source
+            if source == '*':
+                return None
+            paths.append(source.replace('.', '__'))
+        return paths
+
+
+class SparseFieldsetMixin:
+    """
+    View mixin passing the ``?fields=`` parameter to the serializer.
+
+    The serializer class must use ``SparseFieldsetSerializerMixin``.
+    Unknown field names are rejected with 400. ``sparse_required_fields``
+    are always loaded, e.g. the columns the pagination orders by.
+    """
+    fields_query_param = FIELDS_QUERY_PARAM
+    sparse_required_fields = ()
+
+    def get_queryset(self):
+        """Return the queryset limited to the columns of the requested fields."""
+        queryset = super().get_queryset()
+        if self.request.method != 'GET':
+            return queryset
+        fields = self.get_requested_fields()
+        if fields is None:
+            return queryset
+        paths = self.get_serializer_class()().get_source_paths(fields)
+        if paths is None:
+            return queryset
+        paths = [*self.sparse_required_fields, *paths]
+        queryset = queryset.select_related(None).only(*paths)
+        relations = get_relation_paths(queryset.model, paths)
+        # select_related() without arguments would follow every relation
+        return queryset.select_related(*relations) if relations else queryset
+
+    def get_serializer(self, *args, **kwargs):
+        """Return the serializer limited to the requested fields."""
+        if self.request.method == 'GET':
+            kwargs.setdefault('fields', self.get_requested_fields())
+        return super().get_serializer(*args, **kwargs)
+
+    def get_requested_fields(self):
+        """Return the requested field names or None for all fields."""
+        value = self.request.query_params.get(self.fields_query_param)
+        if not value:
+            return None
+        requested = [name.strip() for name in value.split(',') if name.strip()]
+        if not requested:
+            return None
+        available = list(self.get_serializer_class()().fields)
+        unknown = [name for name in requested if name not in available]
+        if unknown:
+            raise ValidationError({self.fields_query_param: (
+                f"Unknown fields: {', '.join(unknown)}. "
+                f"Available: {', '.join(available)}.")})
+        return requested
+
+
+def get_relation_paths(model, paths):
+    """
+    Return the relations traversed by the field ``paths`` of ``model``.
+
+    ``user__username`` traverses ``user``, ``user__rating_summary``
+    traverses ``user`` and ``user__rating_summary``. Foreign key columns
+    given by attname (``user_id``) need no join.
+    """
+    relations = set()
+    for path in paths:
+        current, prefix = model, []
+        for part in path.split('__'):
+            try:
+                field = current._meta.get_field(part)
+            except FieldDoesNotExist:
+                break
+            if not field.is_relation or part == getattr(field, 'attname', None) != field.name:
+                break
+            prefix.append(part)
+            relations.add('__'.join(prefix))
+            current = field.related_model
+    return sorted(relations)
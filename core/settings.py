@@ -40,6 +40,7 @@ INSTALLED_APPS = [
     'rest_framework',
     'corsheaders',
     'rest_framework.authtoken',
+    'core',
     'auth_app',
     'profiles_app',
     'offers_app',
@@ -129,6 +130,55 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Limits for uploaded offer and profile images (see core/uploads.py)
+IMAGE_UPLOAD_MAX_BYTES = 5 * 1024 * 1024
+IMAGE_UPLOAD_MAX_DIMENSION = 4096
+
+# Widths of the thumbnails and WebP variants of uploaded images, generated
+# in a background worker process (see core/image_variants.py)
+IMAGE_VARIANT_WIDTHS = (160, 320, 640)
+IMAGE_VARIANT_WORKERS = 1
+IMAGE_VARIANTS_ASYNC = True
+
+# Lifetime in seconds of stored Idempotency-Key responses (see core/idempotency.py)
+IDEMPOTENCY_KEY_TTL = 24 * 60 * 60
+
+# Maximum number of ids of one ?ids= batch lookup (see core/batch.py)
+BATCH_LOOKUP_MAX_IDS = 50
+
+# Number of recent orders embedded in /api/me/ for business users
+ME_RECENT_ORDERS = 10
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Point this at a shared backend (e.g. Redis or Memcached) when running
+# several worker processes so that cached data and counters are shared.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'coderr-default',
+    }
+}
+
+# Lifetime of cached /api/public-offers/ and anonymous /api/offers/ pages
+OFFER_LIST_CACHE_TIMEOUT = 300
+
+# Per-process cache of serialized profiles (see profiles_app/cache.py)
+PROFILE_CACHE_MAX_ENTRIES = 1024
+PROFILE_CACHE_TTL = 30
+
+# Cache of authenticated tokens (see core/token_cache.py). Entries live in
+# the shared cache for TOKEN_AUTH_CACHE_TTL seconds and in a per-process
+# LRU for TOKEN_AUTH_LOCAL_CACHE_TTL seconds.
+TOKEN_AUTH_CACHE_TTL = 60
+TOKEN_AUTH_LOCAL_CACHE_TTL = 5
+TOKEN_AUTH_LOCAL_CACHE_MAX_ENTRIES = 4096
+
+# Verified Basic auth credentials are remembered for BASIC_AUTH_CACHE_TTL
+# seconds (see core/credential_cache.py).
+BASIC_AUTH_CACHE_TTL = 60
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -152,7 +202,7 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'core.authentication.OptionalTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.BasicAuthentication',
+        'core.authentication.CachedBasicAuthentication',
     ],
 }
 
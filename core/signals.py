@@ -0,0 +1,30 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from .token_cache import evict_token, evict_user_tokens
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def evict_changed_token(sender, instance, **kwargs):
+    """Drop deleted tokens (e.g. on logout) from the token cache."""
+    evict_token(instance.key)
+
+
+@receiver(post_save, sender=get_user_model())
+def evict_tokens_of_changed_user(sender, instance, created=False, update_fields=None, **kwargs):
+    """Cached tokens hold the user, deactivation must take effect at once."""
+    if created:
+        return
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    evict_user_tokens(instance.pk)
+
+
+# Cached tokens hold the profile of their user
+@receiver(post_save, sender='profiles_app.Profile')
+@receiver(post_delete, sender='profiles_app.Profile')
+def evict_tokens_of_changed_profile(sender, instance, **kwargs):
+    """Drop the tokens of a user whose profile changed."""
+    evict_user_tokens(instance.user_id)
@@ -0,0 +1,124 @@
+import base64
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from rest_framework.test import APIRequestFactory, APITestCase
+from orders_app.tests import create_user
+from profiles_app.models import Profile
+from . import credential_cache, token_cache
+from .authentication import CachedTokenAuthentication, get_profile_type
+
+
+def clear_token_cache():
+    """Empty the shared cache, the local LRU and the token cache counters."""
+    cache.clear()
+    token_cache.get_local_cache().clear()
+    token_cache.get_stats()
+    token_cache.reset_stats()
+
+
+class TokenCacheTests(APITestCase):
+    """Cached tokens save their queries and are evicted on changes."""
+
+    def setUp(self):
+        clear_token_cache()
+        self.user, self.token = create_user('business', 'business')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def authenticate(self):
+        request = APIRequestFactory().get(
+            '/', HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        return CachedTokenAuthentication().authenticate(request)
+
+    def test_repeat_request_costs_no_query(self):
+        self.authenticate()
+
+        with self.assertNumQueries(0):
+            user, token = self.authenticate()
+            self.assertEqual(get_profile_type(user), 'business')
+        self.assertEqual((user.pk, token.key), (self.user.pk, self.token.key))
+
+    def test_logout_rejects_the_next_request(self):
+        self.assertEqual(self.client.get('/api/profile/').status_code, 200)
+        self.assertEqual(self.client.post('/api/logout/').status_code, 200)
+
+        self.assertEqual(self.client.get('/api/profile/').status_code, 401)
+
+    def test_deactivation_rejects_the_next_request(self):
+        self.assertEqual(self.client.get('/api/profile/').status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.client.get('/api/profile/').status_code, 401)
+
+    def test_profile_type_change_reaches_the_role_check(self):
+        # Business users pass the permission and fail validation
+        self.assertEqual(self.client.post('/api/offers/', {}).status_code, 400)
+        profile = Profile.objects.get(user=self.user)
+        profile.type = 'customer'
+        profile.save()
+
+        self.assertEqual(self.client.post('/api/offers/', {}).status_code, 403)
+        user, _ = self.authenticate()
+        self.assertEqual(get_profile_type(user), 'customer')
+
+    def test_stats_count_local_shared_and_missed_lookups(self):
+        self.authenticate()
+        self.authenticate()
+        self.authenticate()
+        token_cache.get_local_cache().clear()
+        self.authenticate()
+
+        self.assertEqual(token_cache.get_stats(), {
+            token_cache.LOCAL_HIT_COUNTER: 2,
+            token_cache.SHARED_HIT_COUNTER: 1,
+            token_cache.MISS_COUNTER: 1,
+        })
+
+
+class CredentialCacheTests(APITestCase):
+    """Verified Basic credentials skip the hasher until they change."""
+
+    def setUp(self):
+        cache.clear()
+        self.user, _ = create_user('business', 'business')
+        self.user.set_password('secret')
+        self.user.save()
+
+    def get_profile(self, password='secret'):
+        credentials = base64.b64encode(f'business:{password}'.encode()).decode()
+        return self.client.get(
+            '/api/profile/', HTTP_AUTHORIZATION=f'Basic {credentials}')
+
+    def count_hasher_calls(self):
+        return patch.object(User, 'check_password', autospec=True,
+                            side_effect=User.check_password)
+
+    def test_second_request_skips_the_hasher(self):
+        with self.count_hasher_calls() as check_password:
+            self.assertEqual(self.get_profile().status_code, 200)
+            self.assertEqual(self.get_profile().status_code, 200)
+        self.assertEqual(check_password.call_count, 1)
+
+    def test_changed_password_is_rejected(self):
+        self.assertEqual(self.get_profile().status_code, 200)
+        self.user.set_password('changed')
+        self.user.save()
+
+        self.assertEqual(self.get_profile().status_code, 401)
+        self.assertEqual(self.get_profile('changed').status_code, 200)
+
+    def test_deactivated_user_is_rejected(self):
+        self.assertEqual(self.get_profile().status_code, 200)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        self.assertEqual(self.get_profile().status_code, 401)
+
+    def test_wrong_password_is_not_cached(self):
+        self.assertEqual(self.get_profile('wrong').status_code, 401)
+
+        self.assertIsNone(cache.get(credential_cache.get_cache_key('business', 'wrong')))
+        # The keys of the configured LocMemCache
+        self.assertFalse([key for key in cache._cache
+                          if credential_cache.KEY_PREFIX in key])
@@ -0,0 +1,178 @@
+"""
+Cache of authenticated tokens for CachedTokenAuthentication.
+
+A valid token maps to the fields of its user (without the password hash),
+the fields of the user's profile and the token creation time. Lookups go
+through a per-process LRU first and then through the shared cache
+backend, only misses query the database. Deleting a token, changing or
+deactivating a user and changing its profile evict the entries from the
+local LRU and the shared cache at once. Other worker processes may keep
+using their local entry for up to ``TOKEN_AUTH_LOCAL_CACHE_TTL`` seconds.
+
+Local hits are counted in memory and added to the shared counters in
+batches, so cache hits do not cost a round trip to the cache backend.
+"""
+import hashlib
+import threading
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.authtoken.models import Token
+from . import metrics
+from .lru import TTLLRUCache
+
+KEY_PREFIX = 'auth-token:'
+LOCAL_HIT_COUNTER = 'token_auth_cache.local_hits'
+SHARED_HIT_COUNTER = 'token_auth_cache.shared_hits'
+MISS_COUNTER = 'token_auth_cache.misses'
+# Reverse one-to-one accessor of the profile on the user model
+PROFILE_RELATION = 'profile'
+# Local hits are flushed to the shared counter every this many hits
+LOCAL_HIT_FLUSH = 100
+
+_local_cache = None
+_pending_local_hits = 0
+_lock = threading.Lock()
+
+
+def get_ttl():
+    """Return the lifetime of shared cache entries in seconds."""
+    return getattr(settings, 'TOKEN_AUTH_CACHE_TTL', 60)
+
+
+def get_local_cache():
+    """Return the LRU of this process, created on first use."""
+    global _local_cache
+    if _local_cache is None:
+        _local_cache = TTLLRUCache(
+            maxsize=getattr(settings, 'TOKEN_AUTH_LOCAL_CACHE_MAX_ENTRIES', 4096),
+            ttl=getattr(settings, 'TOKEN_AUTH_LOCAL_CACHE_TTL', 5))
+    return _local_cache
+
+
+def get_cache_key(key):
+    """Return the cache key of a token, raw tokens are never stored as keys."""
+    return KEY_PREFIX + hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def get_user_fields():
+    """Return the cached user columns, everything but the password."""
+    return [field.attname for field in get_user_model()._meta.concrete_fields
+            if field.attname != 'password']
+
+
+def get_profile_fields():
+    """Return the cached profile columns."""
+    return [field.attname for field in _get_profile_model()._meta.concrete_fields]
+
+
+def get_token(key):
+    """
+    Return the cached (user, token) pair of a token key or None.
+
+    The user is rebuilt from the cached columns with its profile attached,
+    the password is loaded lazily if something needs it.
+    """
+    cache_key = get_cache_key(key)
+    entry = get_local_cache().get(cache_key)
+    if entry is not None:
+        _count_local_hit()
+    else:
+        entry = cache.get(cache_key)
+        metrics.increment(MISS_COUNTER if entry is None else SHARED_HIT_COUNTER)
+        if entry is None:
+            return None
+        get_local_cache().set(cache_key, entry)
+    return _build(key, entry)
+
+
+def set_token(user, token):
+    """
+    Store a valid token and its user.
+
+    The profile should be loaded with ``select_related``, users without
+    a profile are cached as such.
+    """
+    profile = getattr(user, PROFILE_RELATION, None)
+    entry = {
+        'user': [getattr(user, name) for name in get_user_fields()],
+        'profile': None if profile is None else [
+            getattr(profile, name) for name in get_profile_fields()],
+        'created': token.created,
+    }
+    cache_key = get_cache_key(token.key)
+    cache.set(cache_key, entry, get_ttl())
+    get_local_cache().set(cache_key, entry)
+
+
+def evict_token(key):
+    """Remove a token from both caches now and after the commit."""
+    cache_key = get_cache_key(key)
+
+    def evict():
+        get_local_cache().delete(cache_key)
+        cache.delete(cache_key)
+
+    evict()
+    # A concurrent request may cache the old state until the commit
+    transaction.on_commit(evict)
+
+
+def evict_user_tokens(user_id):
+    """Remove the tokens of a user from both caches."""
+    for key in Token.objects.filter(user_id=user_id).values_list('key', flat=True):
+        evict_token(key)
+
+
+def get_stats():
+    """Return the hit and miss counters of the token cache."""
+    _flush_local_hits()
+    return metrics.get_counters(LOCAL_HIT_COUNTER, SHARED_HIT_COUNTER, MISS_COUNTER)
+
+
+def reset_stats():
+    """Reset the hit and miss counters of the token cache."""
+    metrics.reset_counters(LOCAL_HIT_COUNTER, SHARED_HIT_COUNTER, MISS_COUNTER)
+
+
+def _build(key, entry):
+    """Rebuild the user, profile and token instances from a cache entry."""
+    user_model = get_user_model()
+    user = user_model.from_db('default', get_user_fields(), entry['user'])
+    profile = None
+    if entry['profile'] is not None:
+        profile = _get_profile_model().from_db(
+            'default', get_profile_fields(), entry['profile'])
+        profile._meta.get_field('user').set_cached_value(profile, user)
+    # A cached None makes user.profile raise DoesNotExist without a query
+    user_model._meta.get_field(PROFILE_RELATION).set_cached_value(user, profile)
+    token = Token.from_db(
+        'default', ['key', 'user_id', 'created'], [key, user.pk, entry['created']])
+    token.user = user
+    return user, token
+
+
+def _get_profile_model():
+    """Return the model of the user profile."""
+    return get_user_model()._meta.get_field(PROFILE_RELATION).related_model
+
+
+def _count_local_hit():
+    """Count a local hit, flushing to the shared counter in batches."""
+    global _pending_local_hits
+    with _lock:
+        _pending_local_hits += 1
+        if _pending_local_hits < LOCAL_HIT_FLUSH:
+            return
+    _flush_local_hits()
+
+
+def _flush_local_hits():
+    """Add the pending local hits to the shared counter."""
+    global _pending_local_hits
+    with _lock:
+        pending, _pending_local_hits = _pending_local_hits, 0
+    if pending:
+        metrics.increment(LOCAL_HIT_COUNTER, pending)
@@ -0,0 +1,155 @@
+"""
+Bounded-memory ingestion of uploaded images.
+
+Base64 data-URIs are decoded chunk by chunk straight into a temporary file
+and multipart uploads are checked in place, so the memory used per upload
+does not grow with the image size. Both paths enforce the same limits:
+
+- ``IMAGE_UPLOAD_MAX_BYTES``: maximum size of the decoded image file.
+- ``IMAGE_UPLOAD_MAX_DIMENSION``: maximum width and height in pixels.
+
+The byte limit is checked before anything is decoded and the dimensions
+are read from the image header as soon as it has been decoded.
+"""
+import base64
+import binascii
+import io
+import tempfile
+
+from django.conf import settings
+from django.core.files import File
+from PIL import Image, UnidentifiedImageError
+from rest_framework import serializers
+
+# Number of base64 characters decoded per step, must be a multiple of 4
+CHUNK_SIZE = 64 * 1024
+# Decoded bytes that are usually enough to read an image header
+HEADER_PROBE_SIZE = 64 * 1024
+
+EXTENSIONS = {
+    'JPEG': 'jpg',
+    'PNG': 'png',
+    'GIF': 'gif',
+    'WEBP': 'webp',
+    'BMP': 'bmp',
+}
+
+
+def get_max_bytes():
+    """Return the maximum accepted image size in bytes."""
+    return getattr(settings, 'IMAGE_UPLOAD_MAX_BYTES', 5 * 1024 * 1024)
+
+
+def get_max_dimension():
+    """Return the maximum accepted image width and height in pixels."""
+    return getattr(settings, 'IMAGE_UPLOAD_MAX_DIMENSION', 4096)
+
+
+def ingest_data_uri(data, filename):
+    """
+    Decode a base64 image data-URI into a temporary uploaded file.
+
+    Args:
+        data: String of the form ``data:image/<type>;base64,<payload>``
+        filename: File name without extension for the stored image
+
+    Returns:
+        File: The decoded image in an anonymous temporary file, positioned
+        at the start
+
+    Raises:
+        serializers.ValidationError: For malformed data or exceeded limits
+    """
+    _, separator, payload = data.partition(';base64,')
+    if not separator:
+        raise serializers.ValidationError(
+            "Invalid image format. Expected file or base64 string.")
+    # Line breaks and spaces inside the payload are allowed, like in b64decode
+    payload = ''.join(payload.split())
+
+    padding = len(payload) - len(payload.rstrip('='))
+    _check_size(len(payload) // 4 * 3 - padding)
+
+    upload = File(tempfile.TemporaryFile(
+        dir=getattr(settings, 'FILE_UPLOAD_TEMP_DIR', None)))
+    head = b''
+    image_format = None
+    size = 0
+    try:
+        for start in range(0, len(payload), CHUNK_SIZE):
+            chunk = _decode_chunk(payload[start:start + CHUNK_SIZE])
+            upload.write(chunk)
+            size += len(chunk)
+            if image_format is None and len(head) < HEADER_PROBE_SIZE:
+                head += chunk
+                image_format = _probe_image(io.BytesIO(head), final=False)
+        if image_format is None:
+            upload.seek(0)
+            image_format = _probe_image(upload, final=True)
+    except serializers.ValidationError:
+        upload.close()
+        raise
+
+    upload.size = size
+    upload.name = f'{filename}.{EXTENSIONS.get(image_format, "img")}'
+    upload.seek(0)
+    return upload
+
+
+def ingest_uploaded_file(upload):
+    """
+    Validate a multipart image upload against the configured limits.
+
+    Only the image header is read, the upload itself stays where Django's
+    upload handlers put it (memory for small files, disk for large ones).
+    """
+    size = getattr(upload, 'size', None)
+    if size is not None:
+        _check_size(size)
+    _probe_image(upload, final=True)
+    upload.seek(0)
+    return upload
+
+
+def _decode_chunk(chunk):
+    """Decode one chunk of base64 text."""
+    try:
+        return base64.b64decode(chunk, validate=True)
+    except (binascii.Error, ValueError):
+        raise serializers.ValidationError("Invalid base64 image data.")
+
+
+def _check_size(size):
+    """Reject images larger than the configured byte limit."""
+    max_bytes = get_max_bytes()
+    if size > max_bytes:
+        raise serializers.ValidationError(
+            f"Image is too large. The maximum size is {max_bytes // 1024} KB.")
+
+
+def _probe_image(fileobj, final):
+    """
+    Read the image header and check the dimensions.
+
+    Returns the Pillow format name, or None if the header is incomplete and
+    ``final`` is False so that more data can be read first.
+    """
+    try:
+        with Image.open(fileobj) as image:
+            width, height = image.size
+            image_format = image.format
+    except Image.DecompressionBombError:
+        raise serializers.ValidationError(
+            "Image dimensions exceed the maximum allowed size.")
+    except (UnidentifiedImageError, OSError):
+        if not final:
+            return None
+        raise serializers.ValidationError(
+            "Upload a valid image. The file is not an image or is corrupted.")
+
+    max_dimension = get_max_dimension()
+    if width > max_dimension or height > max_dimension:
+        raise serializers.ValidationError(
+            f"Image dimensions {width}x{height} exceed the maximum of "
+            f"{max_dimension}x{max_dimension} pixels.")
+    return image_format
@@ -38,14 +38,17 @@ def api_root(request):
             'logout': '/api/logout/',
             'dashboard': '/api/dashboard/',
             'profile': '/api/profile/{pk}/',
+            'profile_batch': '/api/profile/batch/?ids={pk},{pk}',
             'profiles_business': '/api/profiles/business/',
             'profiles_customer': '/api/profiles/customer/',
             'offers': '/api/offers/',
+            'offer_facets': '/api/offers/facets/',
             'public_offers': '/api/public-offers/',
             'my_offers': '/api/my-offers/',
             'public_profiles': '/api/public-profiles/',
             'me': '/api/me/',
             'offerdetails': '/api/offerdetails/{id}/',
+            'offerdetails_batch': '/api/offerdetails/?ids={id},{id}',
             'orders': '/api/orders/',
             'order_count': '/api/order-count/{business_user_id}/',
             'completed_order_count': '/api/completed-order-count/{business_user_id}/',
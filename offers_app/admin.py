@@ -9,14 +9,31 @@ class OfferDetailInline(admin.TabularInline):
 
 @admin.register(Offer)
 class OfferAdmin(admin.ModelAdmin):
-    list_display = ['title', 'owner', 'created_at']
+    list_display = ['title', 'owner', 'min_price', 'min_delivery_time', 'created_at']
     list_filter = ['created_at', 'owner']
     search_fields = ['title', 'description', 'owner__username']
+    readonly_fields = ['min_price', 'min_delivery_time']
     inlines = [OfferDetailInline]
 
+    def save_related(self, request, form, formsets, change):
+        """Save inline details and refresh the denormalized minimums."""
+        super().save_related(request, form, formsets, change)
+        form.instance.update_min_values()
+
 
 @admin.register(OfferDetail)
 class OfferDetailAdmin(admin.ModelAdmin):
     list_display = ['title', 'offer', 'price', 'delivery_time_in_days']
     list_filter = ['price', 'delivery_time_in_days']
     search_fields = ['title', 'offer__title']
+
+    def save_model(self, request, obj, form, change):
+        """Save the detail and refresh the offer's denormalized minimums."""
+        super().save_model(request, obj, form, change)
+        obj.offer.update_min_values()
+
+    def delete_model(self, request, obj):
+        """Delete the detail and refresh the offer's denormalized minimums."""
+        offer = obj.offer
+        super().delete_model(request, obj)
+        offer.update_min_values()
@@ -3,6 +3,8 @@ from . import views
 
 urlpatterns = [
     # For /api/offerdetails/ endpoints - individual offer details
+    path('', views.OfferDetailBatchView.as_view(),
+         name='offer-detail-batch'),  # GET /api/offerdetails/?ids=1,2,3
     path('<int:pk>/', views.OfferDetailDetailView.as_view(),
          name='offer-detail-detail'),
 ]
@@ -1,4 +1,5 @@
 from rest_framework import permissions
+from core.authentication import get_profile_type
 
 
 class IsOwnerOrReadOnly(permissions.BasePermission):
@@ -40,9 +41,7 @@ class IsBusinessUser(permissions.BasePermission):
             return False
 
         # Only business users can create offers
-        return hasattr(
-            request.user,
-            'profile') and request.user.profile.type == 'business'
+        return get_profile_type(request.user) == 'business'
 
 
 class IsCustomerUser(permissions.BasePermission):
@@ -57,7 +56,4 @@ class IsCustomerUser(permissions.BasePermission):
             return False
 
         # Check if user has a customer profile
-        try:
-            return request.user.profile.type == 'customer'
-        except AttributeError:
-            return False
+        return get_profile_type(request.user) == 'customer'
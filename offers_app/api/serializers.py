@@ -1,51 +1,11 @@
 from rest_framework import serializers
 from ..models import Offer, OfferDetail
 from django.contrib.auth.models import User
-from django.db import models
-import base64
-from django.core.files.base import ContentFile
-
-
-class Base64OrFileImageField(serializers.Field):
-    """
-    Custom field that accepts either a base64 string or a file upload.
-    """
-
-    def to_internal_value(self, data):
-        """Process image data from various formats."""
-        print(f"DEBUG: Image field received data type: {type(data)}, value: {data}")
-
-        # Handle file upload (from FormData)
-        if hasattr(data, 'read'):
-            print("DEBUG: Processing as file upload")
-            return data
-
-        # Handle base64 string
-        if isinstance(data, str) and data.startswith('data:image'):
-            print("DEBUG: Processing as base64 string")
-            return self._process_base64_image(data)
-
-        return self._handle_empty_or_invalid_data(data)
-
-    def _handle_empty_or_invalid_data(self, data):
-        """Handle empty or invalid image data."""
-        if not data:
-            print("DEBUG: No image data provided")
-            return None
-
-        print(f"DEBUG: Invalid image format: {data}")
-        raise serializers.ValidationError(
-            "Invalid image format. Expected file or base64 string.")
-
-    def _process_base64_image(self, data):
-        """Convert base64 string to file."""
-        format, imgstr = data.split(';base64,')
-        ext = format.split('/')[-1]
-        return ContentFile(base64.b64decode(imgstr), name=f'offer_image.{ext}')
-
-    def to_representation(self, value):
-        """Return representation of the object."""
-        return None  # We don't need to return the image data
+from django.db import transaction
+from django.utils import timezone
+from core.fields import Base64OrFileImageField
+from core.image_variants import get_variant_urls
+from reviews_app.models import BusinessRatingSummary
 
 
 class OfferDetailSerializer(serializers.ModelSerializer):
@@ -96,10 +56,12 @@ class OfferSerializer(serializers.ModelSerializer):
     """
     user = serializers.SerializerMethodField()
     user_details = UserDetailsSerializer(source='owner', read_only=True)
+    user_rating = serializers.SerializerMethodField()
     details = OfferDetailSerializer(source='offer_details', many=True, read_only=True)
-    min_price = serializers.SerializerMethodField()
-    min_delivery_time = serializers.SerializerMethodField()
+    min_price = serializers.DecimalField(
+        max_digits=10, decimal_places=2, read_only=True, coerce_to_string=False)
     image = serializers.SerializerMethodField()  # For frontend compatibility
+    image_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = Offer
@@ -107,9 +69,11 @@ class OfferSerializer(serializers.ModelSerializer):
             'id',
             'user',
             'user_details',
+            'user_rating',
             'title',
             'file',
             'image',
+            'image_variants',
             'description',
             'details',
             'min_price',
@@ -120,6 +84,7 @@ class OfferSerializer(serializers.ModelSerializer):
             'id',
             'user',
             'user_details',
+            'user_rating',
             'min_price',
             'min_delivery_time',
             'created_at',
@@ -129,6 +94,10 @@ class OfferSerializer(serializers.ModelSerializer):
         """Return the owner's ID as 'user' field."""
         return obj.owner.id
 
+    def get_user_rating(self, obj):
+        """Return the review count, average and histogram of the owner."""
+        return BusinessRatingSummary.for_user(obj.owner).as_dict()
+
     def get_image(self, obj):
         """Return the same value as file field for frontend compatibility."""
         if obj.file:
@@ -138,19 +107,9 @@ class OfferSerializer(serializers.ModelSerializer):
             return obj.file.url
         return None
 
-    def get_min_price(self, obj):
-        """Return the minimum price from offer details."""
-        if obj.offer_details.exists():
-            return obj.offer_details.aggregate(
-                min_price=models.Min('price'))['min_price']
-        return None
-
-    def get_min_delivery_time(self, obj):
-        """Return the minimum delivery time from offer details."""
-        if obj.offer_details.exists():
-            return obj.offer_details.aggregate(
-                min_time=models.Min('delivery_time_in_days'))['min_time']
-        return None
+    def get_image_variants(self, obj):
+        """Return the URLs of the resized variants of the image by width."""
+        return get_variant_urls(obj, self.context.get('request'))
 
 
 class OfferCreateSerializer(serializers.ModelSerializer):
@@ -180,14 +139,19 @@ class OfferCreateSerializer(serializers.ModelSerializer):
         if image_data:
             validated_data['file'] = image_data
 
-        offer = Offer.objects.create(**validated_data)
-        self._create_offer_details(offer, details_data)
+        offer = Offer(**validated_data)
+        details = [OfferDetail(offer=offer, **data) for data in details_data]
+        offer.set_min_values(details)
+        with transaction.atomic():
+            offer.save()
+            self._create_offer_details(offer, details)
         return offer
 
-    def _create_offer_details(self, offer, details_data):
-        """Create offer details for the offer."""
-        for detail_data in details_data:
-            OfferDetail.objects.create(offer=offer, **detail_data)
+    def _create_offer_details(self, offer, details):
+        """Insert all offer details with a single statement."""
+        for detail in details:
+            detail.offer = offer
+        OfferDetail.objects.bulk_create(details)
 
 
 class OfferUpdateSerializer(serializers.ModelSerializer):
@@ -203,7 +167,16 @@ class OfferUpdateSerializer(serializers.ModelSerializer):
         fields = ['title', 'description', 'image', 'details']
 
     def update(self, instance, validated_data):
-        """Update offer with new data."""
+        """
+        Update offer with new data.
+
+        Details are matched to the existing ones by offer_type. Matching
+        details are updated in place (keeping their ids and orders), new
+        offer types are inserted and, for full updates (PUT), offer types
+        missing from the request are deleted. Orders placed on a deleted
+        detail keep their snapshot and lose only the link. Each kind of change is one
+        bulk statement, so the write takes a constant number of queries.
+        """
         details_data = validated_data.pop('details', [])
         image_data = validated_data.pop('image', None)
 
@@ -211,8 +184,14 @@ class OfferUpdateSerializer(serializers.ModelSerializer):
         if image_data:
             instance.file = image_data
 
-        self._update_offer_fields(instance, validated_data)
-        self._update_offer_details(instance, details_data)
+        with transaction.atomic():
+            changes = None
+            if details_data:
+                changes = self._plan_detail_changes(instance, details_data)
+                instance.set_min_values(changes['final'])
+            self._update_offer_fields(instance, validated_data)
+            if changes:
+                self._apply_detail_changes(instance, changes)
         return instance
 
     def _update_offer_fields(self, instance, validated_data):
@@ -221,26 +200,77 @@ class OfferUpdateSerializer(serializers.ModelSerializer):
             setattr(instance, attr, value)
         instance.save()
 
-    def _update_offer_details(self, instance, details_data):
-        """Update offer details with proper validation."""
-        if details_data:
-            # Clear existing details
-            instance.offer_details.all().delete()
-            
-            # Create new details with offer_type validation
-            for detail_data in details_data:
-                # Validate offer_type is provided
-                if 'offer_type' not in detail_data:
-                    raise serializers.ValidationError(
-                        "offer_type is required for each detail when updating offers"
-                    )
-                
-                # Validate offer_type value
-                valid_types = ['basic', 'standard', 'premium']
-                offer_type = detail_data.get('offer_type')
-                if offer_type not in valid_types:
+    def _validate_offer_types(self, details_data):
+        """Validate that every detail has a valid, unique offer_type."""
+        valid_types = ['basic', 'standard', 'premium']
+        seen = set()
+        for detail_data in details_data:
+            # Validate offer_type is provided
+            if 'offer_type' not in detail_data:
+                raise serializers.ValidationError(
+                    "offer_type is required for each detail when updating offers"
+                )
+
+            # Validate offer_type value
+            offer_type = detail_data.get('offer_type')
+            if offer_type not in valid_types:
+                raise serializers.ValidationError(
+                    f"Invalid offer_type '{offer_type}'. Must be one of: {valid_types}"
+                )
+            if offer_type in seen:
+                raise serializers.ValidationError(
+                    f"offer_type '{offer_type}' is given more than once."
+                )
+            seen.add(offer_type)
+
+    def _plan_detail_changes(self, instance, details_data):
+        """
+        Diff the requested details against the stored ones.
+
+        Returns a dict with the details to update, create and delete, the
+        changed field names and the resulting set of details.
+        """
+        self._validate_offer_types(details_data)
+        existing = {d.offer_type: d for d in instance.offer_details.all()}
+        now = timezone.now()
+
+        to_update, to_create, fields = [], [], {'updated_at'}
+        for detail_data in details_data:
+            detail = existing.pop(detail_data['offer_type'], None)
+            if detail is None:
+                missing = [f for f in ('title', 'price') if f not in detail_data]
+                if missing:
                     raise serializers.ValidationError(
-                        f"Invalid offer_type '{offer_type}'. Must be one of: {valid_types}"
+                        f"New offer_type '{detail_data['offer_type']}' "
+                        f"requires: {', '.join(missing)}"
                     )
-                
-                OfferDetail.objects.create(offer=instance, **detail_data)
+                to_create.append(OfferDetail(offer=instance, **detail_data))
+                continue
+            for attr, value in detail_data.items():
+                setattr(detail, attr, value)
+            detail.updated_at = now
+            fields.update(detail_data)
+            to_update.append(detail)
+
+        # PATCH keeps the tiers that are not part of the request
+        to_delete = [] if self.partial else list(existing.values())
+        kept = [] if not self.partial else list(existing.values())
+        return {
+            'update': to_update,
+            'create': to_create,
+            'delete': to_delete,
+            'fields': sorted(fields),
+            'final': to_update + to_create + kept,
+        }
+
+    def _apply_detail_changes(self, instance, changes):
+        """Write the planned detail changes with one statement per kind."""
+        if changes['update']:
+            OfferDetail.objects.bulk_update(changes['update'], changes['fields'])
+        if changes['create']:
+            OfferDetail.objects.bulk_create(changes['create'])
+        if changes['delete']:
+            OfferDetail.objects.filter(
+                id__in=[detail.id for detail in changes['delete']]).delete()
+        # Details were changed in bulk, drop a stale prefetch of the old ones
+        getattr(instance, '_prefetched_objects_cache', {}).pop('offer_details', None)
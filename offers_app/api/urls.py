@@ -4,5 +4,6 @@ from . import views
 urlpatterns = [
     # For /api/offers/ endpoints
     path('', views.OfferListCreateView.as_view(), name='offer-list-create'),
+    path('facets/', views.OfferFacetsView.as_view(), name='offer-facets'),
     path('<int:pk>/', views.OfferDetailView.as_view(), name='offer-detail'),
 ]
@@ -3,13 +3,18 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.generics import (
     ListCreateAPIView, RetrieveUpdateDestroyAPIView,
-    RetrieveAPIView, ListAPIView
+    RetrieveAPIView, ListAPIView, GenericAPIView
 )
 from rest_framework.exceptions import NotAuthenticated, PermissionDenied, ValidationError
 from django.http import Http404
 from rest_framework.pagination import PageNumberPagination
-from django.db.models import Q, Min
+from core.batch import BatchLookupMixin
+from core.conditional import ConditionalGetMixin
+from core.pagination import CursorPaginationMixin, KeysetPagination
 from ..models import Offer, OfferDetail
+from ..facets import get_offer_facets, parse_bucket_count
+from ..search import search_offers
+from .. import cache as offer_cache
 from .serializers import (
     OfferSerializer, OfferCreateSerializer,
     OfferUpdateSerializer, OfferDetailSerializer
@@ -37,96 +42,135 @@ class CustomPageNumberPagination(PageNumberPagination):
         return self.page_size
 
 
-class PublicOfferListView(ListAPIView):
+class OfferCursorPagination(KeysetPagination):
+    """Keyset pagination for the offer lists, opt-in via ``?cursor=``."""
+    orderings = (
+        '-created_at',
+        'created_at',
+        '-updated_at',
+        'updated_at',
+        'min_price',
+        '-min_price')
+
+
+class OfferListMixin(CursorPaginationMixin):
     """
-    Public list of offers with filtering, search, and pagination.
+    Shared filtering and ordering for the offer list endpoints.
+
+    Filters and ordering read the denormalized ``min_price`` and
+    ``min_delivery_time`` columns of the offer, so no aggregation is needed.
+    Searches use the full-text index, ``ordering=relevance`` sorts search
+    results by rank. Requests with a ``cursor`` parameter are paginated with keyset
+    pagination instead of page numbers. The rank is no column to seek on, so
+    relevance ordering is rejected in cursor mode.
     """
-    serializer_class = OfferSerializer
-    permission_classes = [AllowAny]
-    pagination_class = CustomPageNumberPagination
+    cursor_pagination_class = OfferCursorPagination
+    valid_orderings = [
+        'created_at',
+        '-created_at',
+        'updated_at',
+        '-updated_at',
+        'min_price',
+        '-min_price']
+    default_ordering = '-created_at'
+    # Response cache scope, None disables caching for the view
+    cache_scope = None
+    cache_authenticated_requests = False
 
     def list(self, request, *args, **kwargs):
-        """Override list to handle validation errors."""
+        """Serve cached pages if possible."""
+        parent_list = super().list
+        return self._serve_cached(
+            request, lambda: parent_list(request, *args, **kwargs))
+
+    def _serve_cached(self, request, build_response):
+        """Return the cached response or build it, handling validation errors."""
+        cache_key = None
+        if self._is_cacheable(request):
+            cache_key = offer_cache.get_cache_key(request, self.cache_scope)
+            data = offer_cache.get_cached_page(cache_key)
+            if data is not None:
+                return Response(data, headers={'X-Cache': 'HIT'})
+
         try:
-            return super().list(request, *args, **kwargs)
+            response = build_response()
         except Exception as e:
             if isinstance(e, ValidationError):
                 return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
             raise
 
+        if cache_key and response.status_code == status.HTTP_200_OK:
+            offer_cache.set_cached_page(cache_key, response.data)
+            response['X-Cache'] = 'MISS'
+        return response
+
+    def _is_cacheable(self, request):
+        """Check whether the response may be served from the cache."""
+        if self.cache_scope is None:
+            return False
+        return self.cache_authenticated_requests or not request.user.is_authenticated
+
     def get_queryset(self):
         """Get filtered queryset based on query parameters."""
         # Validate query parameters first
         self._validate_query_params()
-        
+
         queryset = (Offer.objects.all()
-                    .select_related('owner')
+                    .select_related('owner', 'owner__rating_summary')
                     .prefetch_related('offer_details'))
 
-        # Always annotate with min_price and min_delivery_time for consistent filtering
-        queryset = queryset.annotate(
-            calculated_min_price=Min('offer_details__price'),
-            calculated_min_delivery=Min('offer_details__delivery_time_in_days')
-        )
-
         # Apply filters
         queryset = self._apply_filters(queryset)
 
         # Apply ordering
-        ordering = self.request.query_params.get('ordering', '-created_at')
-        valid_orderings = [
-            'created_at',
-            '-created_at',
-            'updated_at',
-            '-updated_at',
-            'min_price',
-            '-min_price']
-
-        if ordering in valid_orderings:
-            if ordering == 'min_price':
-                queryset = queryset.order_by('calculated_min_price')
-            elif ordering == '-min_price':
-                queryset = queryset.order_by('-calculated_min_price')
-            else:
-                queryset = queryset.order_by(ordering)
-        else:
-            queryset = queryset.order_by('-created_at')
-
-        return queryset
+        ordering = self._get_ordering()
+        if ordering == 'relevance':
+            return queryset.order_by('-search_rank', '-created_at')
+        return queryset.order_by(ordering)
+
+    def _get_ordering(self):
+        """Return the requested ordering or the default one."""
+        ordering = self.request.query_params.get('ordering', self.default_ordering)
+        if ordering == 'relevance':
+            # Relevance only exists for search requests
+            search = self.request.query_params.get('search', '')
+            return ordering if search.strip() else self.default_ordering
+        if ordering in self.valid_orderings:
+            return ordering
+        return self.default_ordering
 
     def _validate_query_params(self):
         """Validate query parameters and raise ValidationError if invalid."""
         # Validate max_delivery_time parameter
         max_delivery_time = self.request.query_params.get('max_delivery_time')
-        print(f"DEBUG: max_delivery_time = {max_delivery_time}")
         if max_delivery_time:
             try:
                 max_delivery_time = int(max_delivery_time)
-                print(f"DEBUG: Converted to int: {max_delivery_time}")
                 if max_delivery_time <= 0:
                     raise ValidationError(
                         {"max_delivery_time": "Delivery time must be a positive integer."}
                     )
-            except (ValueError, TypeError) as e:
-                print(f"DEBUG: ValueError/TypeError: {e}")
+            except (ValueError, TypeError):
                 raise ValidationError(
                     {"max_delivery_time": "Invalid delivery time. Must be a positive integer."}
                 )
 
+        cursor_param = self.cursor_pagination_class.cursor_query_param
+        if cursor_param in self.request.query_params and self._get_ordering() == 'relevance':
+            raise ValidationError({"ordering": (
+                "Relevance ordering is not available with cursor pagination. "
+                f"Use page numbers or one of: {', '.join(self.cursor_pagination_class.orderings)}."
+            )})
+
     def _apply_filters(self, queryset):
         """Apply filters based on query parameters."""
-        # KORREKT: Filter direkt auf die berechneten min_price und
-        # min_delivery_time Felder
-
         # Min price filter - Filtert auf das min_price Feld des Angebots (>=)
         min_price = self.request.query_params.get('min_price')
         if min_price:
             try:
                 min_price = float(min_price)
                 if min_price >= 0:
-                    # Filter basierend auf der Annotation calculated_min_price (>= für
-                    # minimum)
-                    queryset = queryset.filter(calculated_min_price__gte=min_price)
+                    queryset = queryset.filter(min_price__gte=min_price)
             except (ValueError, TypeError):
                 # Invalid values are ignored, return all offers
                 pass
@@ -137,9 +181,7 @@ class PublicOfferListView(ListAPIView):
             try:
                 max_price = float(max_price)
                 if max_price >= 0:
-                    # Filter basierend auf der Annotation calculated_min_price (<= für
-                    # maximum)
-                    queryset = queryset.filter(calculated_min_price__lte=max_price)
+                    queryset = queryset.filter(min_price__lte=max_price)
             except (ValueError, TypeError):
                 # Invalid values are ignored, return all offers
                 pass
@@ -150,8 +192,7 @@ class PublicOfferListView(ListAPIView):
             try:
                 exact_price = float(exact_price)
                 if exact_price >= 0:
-                    # Filter basierend auf der Annotation calculated_min_price (= für exakt)
-                    queryset = queryset.filter(calculated_min_price=exact_price)
+                    queryset = queryset.filter(min_price=exact_price)
             except (ValueError, TypeError):
                 # Invalid values are ignored, return all offers
                 pass
@@ -163,24 +204,18 @@ class PublicOfferListView(ListAPIView):
             try:
                 max_delivery_time = int(max_delivery_time)
                 if max_delivery_time > 0:
-                    # Filter basierend auf der Annotation calculated_min_delivery (<=
-                    # für maximum)
                     queryset = queryset.filter(
-                        calculated_min_delivery__lte=max_delivery_time)
+                        min_delivery_time__lte=max_delivery_time)
             except (ValueError, TypeError):
                 # This should not happen as validation is done in get_queryset
                 pass
 
-        # Search filter (title and description)
+        # Search filter (title and description) via the full-text index
         search = self.request.query_params.get('search')
         if search and search.strip():
-            search = search.strip()
-            queryset = queryset.filter(
-                Q(title__icontains=search) | Q(description__icontains=search)
-            ).distinct()
-            # If no results found after search, return empty queryset
-            if not queryset.exists():
-                return queryset.none()
+            queryset = search_offers(
+                queryset, search,
+                with_rank=self._get_ordering() == 'relevance')
 
         # Creator ID filter
         creator_id = self.request.query_params.get('creator_id')
@@ -194,12 +229,50 @@ class PublicOfferListView(ListAPIView):
         return queryset
 
 
-class OfferListCreateView(ListCreateAPIView):
+class PublicOfferListView(OfferListMixin, ListAPIView):
+    """
+    Public list of offers with filtering, search, and pagination.
+    """
+    serializer_class = OfferSerializer
+    permission_classes = [AllowAny]
+    pagination_class = CustomPageNumberPagination
+    cache_scope = 'public-offers'
+    cache_authenticated_requests = True
+
+
+class OfferFacetsView(OfferListMixin, GenericAPIView):
+    """
+    Facets of the offer catalog for building filter controls.
+
+    Accepts the filter parameters of the offer lists and returns the price
+    range with a histogram of offer min prices (``buckets`` sets the number
+    of buckets), delivery time counts and per offer type counts.
+    """
+    permission_classes = [AllowAny]
+    cache_scope = 'offer-facets'
+    cache_authenticated_requests = True
+
+    def get(self, request, *args, **kwargs):
+        """Return the facets of the offers matching the filters."""
+        return self._serve_cached(request, self._get_facets_response)
+
+    def _get_facets_response(self):
+        """Calculate the facets of the filtered offers."""
+        self._validate_query_params()
+        queryset = self._apply_filters(Offer.objects.all())
+        buckets = parse_bucket_count(self.request.query_params.get('buckets'))
+        return Response(get_offer_facets(queryset, buckets))
+
+
+class OfferListCreateView(OfferListMixin, ListCreateAPIView):
     """
     List all offers or create a new offer.
     """
-    queryset = Offer.objects.all().select_related('owner').prefetch_related('offer_details')
+    queryset = (Offer.objects.all()
+                .select_related('owner', 'owner__rating_summary')
+                .prefetch_related('offer_details'))
     pagination_class = CustomPageNumberPagination  # Fix: Add pagination
+    cache_scope = 'offers'
 
     def get_serializer_class(self):
         """Return appropriate serializer class."""
@@ -213,154 +286,6 @@ class OfferListCreateView(ListCreateAPIView):
             return [IsBusinessUser()]
         return [AllowAny()]
 
-    def get_queryset(self):
-        """Get filtered queryset based on query parameters."""
-        # Validate query parameters first
-        self._validate_query_params()
-        
-        queryset = (Offer.objects.all()
-                    .select_related('owner')
-                    .prefetch_related('offer_details'))
-
-        # Always annotate with min_price and min_delivery_time for consistent filtering
-        queryset = queryset.annotate(
-            calculated_min_price=Min('offer_details__price'),
-            calculated_min_delivery=Min('offer_details__delivery_time_in_days')
-        )
-
-        # Apply filters
-        queryset = self._apply_filters(queryset)
-
-        # Apply ordering
-        ordering = self.request.query_params.get('ordering', '-created_at')
-        valid_orderings = [
-            'created_at',
-            '-created_at',
-            'updated_at',
-            '-updated_at',
-            'min_price',
-            '-min_price']
-
-        if ordering in valid_orderings:
-            if ordering == 'min_price':
-                queryset = queryset.order_by('calculated_min_price')
-            elif ordering == '-min_price':
-                queryset = queryset.order_by('-calculated_min_price')
-            else:
-                queryset = queryset.order_by(ordering)
-        else:
-            queryset = queryset.order_by('-created_at')
-
-        return queryset
-
-    def _validate_query_params(self):
-        """Validate query parameters and raise ValidationError if invalid."""
-        # Validate max_delivery_time parameter
-        max_delivery_time = self.request.query_params.get('max_delivery_time')
-        print(f"DEBUG: max_delivery_time = {max_delivery_time}")
-        if max_delivery_time:
-            try:
-                max_delivery_time = int(max_delivery_time)
-                print(f"DEBUG: Converted to int: {max_delivery_time}")
-                if max_delivery_time <= 0:
-                    raise ValidationError(
-                        {"max_delivery_time": "Delivery time must be a positive integer."}
-                    )
-            except (ValueError, TypeError) as e:
-                print(f"DEBUG: ValueError/TypeError: {e}")
-                raise ValidationError(
-                    {"max_delivery_time": "Invalid delivery time. Must be a positive integer."}
-                )
-
-    def _apply_filters(self, queryset):
-        """Apply filters based on query parameters."""
-        # KORREKT: Filter direkt auf die berechneten min_price und
-        # min_delivery_time Felder
-
-        # Min price filter - Filtert auf das min_price Feld des Angebots (>=)
-        min_price = self.request.query_params.get('min_price')
-        if min_price:
-            try:
-                min_price = float(min_price)
-                if min_price >= 0:
-                    # Filter basierend auf der Annotation calculated_min_price (>= für
-                    # minimum)
-                    queryset = queryset.filter(calculated_min_price__gte=min_price)
-            except (ValueError, TypeError):
-                # Invalid values are ignored, return all offers
-                pass
-
-        # Max price filter - Filtert auf das min_price Feld des Angebots (<=)
-        max_price = self.request.query_params.get('max_price')
-        if max_price:
-            try:
-                max_price = float(max_price)
-                if max_price >= 0:
-                    # Filter basierend auf der Annotation calculated_min_price (<= für
-                    # maximum)
-                    queryset = queryset.filter(calculated_min_price__lte=max_price)
-            except (ValueError, TypeError):
-                # Invalid values are ignored, return all offers
-                pass
-
-        # Exact price filter - Filtert nach exaktem min_price Wert (=)
-        exact_price = self.request.query_params.get('exact_price')
-        if exact_price:
-            try:
-                exact_price = float(exact_price)
-                if exact_price >= 0:
-                    # Filter basierend auf der Annotation calculated_min_price (= für exakt)
-                    queryset = queryset.filter(calculated_min_price=exact_price)
-            except (ValueError, TypeError):
-                # Invalid values are ignored, return all offers
-                pass
-
-        # Max delivery time filter - Filtert auf das min_delivery_time Feld des
-        # Angebots (<=)
-        max_delivery_time = self.request.query_params.get('max_delivery_time')
-        if max_delivery_time:
-            try:
-                max_delivery_time = int(max_delivery_time)
-                if max_delivery_time > 0:
-                    # Filter basierend auf der Annotation calculated_min_delivery (<=
-                    # für maximum)
-                    queryset = queryset.filter(
-                        calculated_min_delivery__lte=max_delivery_time)
-            except (ValueError, TypeError):
-                # This should not happen as validation is done in get_queryset
-                pass
-
-        # Search filter (title and description)
-        search = self.request.query_params.get('search')
-        if search and search.strip():
-            search = search.strip()
-            queryset = queryset.filter(
-                Q(title__icontains=search) | Q(description__icontains=search)
-            ).distinct()
-            # If no results found after search, return empty queryset
-            if not queryset.exists():
-                return queryset.none()
-
-        # Creator ID filter
-        creator_id = self.request.query_params.get('creator_id')
-        if creator_id:
-            try:
-                creator_id = int(creator_id)
-                queryset = queryset.filter(owner_id=creator_id)
-            except (ValueError, TypeError):
-                pass
-
-        return queryset
-
-    def list(self, request, *args, **kwargs):
-        """Override list to handle validation errors."""
-        try:
-            return super().list(request, *args, **kwargs)
-        except Exception as e:
-            if isinstance(e, ValidationError):
-                return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
-            raise
-
     def perform_create(self, serializer):
         """Perform object creation."""
         serializer.save(owner=self.request.user)
@@ -389,11 +314,17 @@ class OfferListCreateView(ListCreateAPIView):
             headers=headers)
 
 
-class OfferDetailView(RetrieveUpdateDestroyAPIView):
+class OfferDetailView(ConditionalGetMixin, RetrieveUpdateDestroyAPIView):
     """
     Retrieve, update or delete an offer.
     """
-    queryset = Offer.objects.all().select_related('owner').prefetch_related('offer_details')
+    queryset = (Offer.objects.all()
+                .select_related('owner', 'owner__rating_summary')
+                .prefetch_related('offer_details'))
+    # Owner names are edited through the profile, which bumps its timestamp
+    last_modified_fields = (
+        'updated_at', 'offer_details__updated_at', 'owner__profile__updated_at',
+        'owner__rating_summary__updated_at')
 
     def get_permissions(self):
         """Return appropriate permissions."""
@@ -483,7 +414,7 @@ class OfferDetailView(RetrieveUpdateDestroyAPIView):
         return obj
 
 
-class OfferDetailDetailView(RetrieveAPIView):
+class OfferDetailDetailView(ConditionalGetMixin, RetrieveAPIView):
     """
     Retrieve an individual offer detail.
     """
@@ -503,6 +434,15 @@ class OfferDetailDetailView(RetrieveAPIView):
         return super().get_object()
 
 
+class OfferDetailBatchView(BatchLookupMixin, GenericAPIView):
+    """
+    Retrieve several offer details at once via ``?ids=1,2,3``.
+    """
+    queryset = OfferDetail.objects.all()
+    serializer_class = OfferDetailSerializer
+    permission_classes = [IsAuthenticated]
+
+
 class MyOffersView(ListAPIView):
     """
     Get authenticated user's offers.
@@ -514,4 +454,4 @@ class MyOffersView(ListAPIView):
     def get_queryset(self):
         """Get current user's offers."""
         return Offer.objects.filter(owner=self.request.user).select_related(
-            'owner').prefetch_related('offer_details')
+            'owner', 'owner__rating_summary').prefetch_related('offer_details')
@@ -0,0 +1,109 @@
+"""
+Response cache for the public offer catalog.
+
+Cached pages are keyed by the normalized query parameters and by a catalog
+version. Every write to an offer, offer detail or offer owner bumps the
+version after the transaction commits, which makes all previously cached
+pages unreachable, so stale pages are never served.
+"""
+import hashlib
+import time
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.core.cache import cache
+from core import metrics
+from .search import get_search_terms
+
+CATALOG_VERSION_KEY = 'offers:catalog-version'
+HIT_COUNTER = 'offer_list_cache.hits'
+MISS_COUNTER = 'offer_list_cache.misses'
+
+DECIMAL_PARAMS = ('min_price', 'max_price', 'exact_price')
+INTEGER_PARAMS = (
+    'max_delivery_time', 'creator_id', 'page', 'page_size', 'buckets')
+TEXT_PARAMS = ('ordering', 'cursor', 'count')
+
+
+def get_cache_timeout():
+    """Return the lifetime of cached catalog pages in seconds."""
+    return getattr(settings, 'OFFER_LIST_CACHE_TIMEOUT', 300)
+
+
+def get_catalog_version():
+    """Return the current catalog version."""
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        # Start from the clock so a lost version never reuses old keys
+        cache.add(CATALOG_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    """Invalidate all cached catalog pages."""
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.set(CATALOG_VERSION_KEY, time.time_ns(), None)
+
+
+def normalize_params(query_params):
+    """
+    Reduce the query parameters to the ones that influence the response.
+
+    Values are canonicalized (``10`` and ``10.0`` are the same price, search
+    text is reduced to its search terms) so equivalent requests share a
+    cache entry.
+    """
+    normalized = []
+    for name in DECIMAL_PARAMS:
+        value = query_params.get(name, '').strip()
+        try:
+            normalized.append((name, str(Decimal(value).normalize())))
+        except (InvalidOperation, ValueError):
+            continue
+    for name in INTEGER_PARAMS:
+        value = query_params.get(name, '').strip()
+        try:
+            normalized.append((name, str(int(value))))
+        except ValueError:
+            if value:
+                normalized.append((name, value))
+    search = query_params.get('search')
+    if search and search.strip():
+        normalized.append(('search', ' '.join(get_search_terms(search))))
+    for name in TEXT_PARAMS:
+        if name in query_params:
+            normalized.append((name, query_params.get(name)))
+    return normalized
+
+
+def get_cache_key(request, scope):
+    """Build the cache key of a catalog request."""
+    params = normalize_params(request.query_params)
+    raw = f'{request.scheme}://{request.get_host()}|{params!r}'
+    digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+    return f'offers:list:{scope}:{get_catalog_version()}:{digest}'
+
+
+def get_cached_page(key):
+    """Return the cached response data for ``key`` and count the lookup."""
+    data = cache.get(key)
+    metrics.increment(MISS_COUNTER if data is None else HIT_COUNTER)
+    return data
+
+
+def set_cached_page(key, data):
+    """Store response data for ``key``."""
+    cache.set(key, data, get_cache_timeout())
+
+
+def get_stats():
+    """Return the hit and miss counters of the catalog cache."""
+    return metrics.get_counters(HIT_COUNTER, MISS_COUNTER)
+
+
+def reset_stats():
+    """Reset the hit and miss counters of the catalog cache."""
+    metrics.reset_counters(HIT_COUNTER, MISS_COUNTER)
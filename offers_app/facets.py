@@ -0,0 +1,95 @@
+"""
+Facet counts for the offer catalog.
+
+The facets of a filtered offer queryset are counted by the database in
+two queries, so the cost of a cache miss does not grow with the number
+of offers read into Python:
+
+- one aggregate query for the offer count, the price range, the
+  cumulative delivery time counts and the offer type counts, joined to
+  the offer details and counted with ``distinct``,
+- one grouped query over a ``Case``/``When`` price bucket expression for
+  the price histogram.
+"""
+from decimal import Decimal
+
+from django.db.models import Case, Count, IntegerField, Max, Min, Q, Value, When
+
+from .models import OfferDetail
+
+DEFAULT_PRICE_BUCKETS = 10
+MAX_PRICE_BUCKETS = 50
+# Upper bounds in days, matching the max_delivery_time filter
+DELIVERY_BUCKETS = (1, 3, 7, 14, 30)
+OFFER_TYPES = [offer_type for offer_type, _ in OfferDetail.OFFER_TYPE_CHOICES]
+
+CENT = Decimal('0.01')
+
+
+def get_offer_facets(queryset, buckets=DEFAULT_PRICE_BUCKETS):
+    """
+    Calculate the facets of the offers in ``queryset``.
+
+    Returns a dict with the number of offers, the price range with a
+    histogram of offer min prices in ``buckets`` equal-width buckets,
+    cumulative counts per delivery time bound and the number of offers
+    per offer type.
+    """
+    queryset = queryset.order_by()
+    totals = queryset.aggregate(
+        count=Count('pk', distinct=True),
+        low=Min('min_price'),
+        high=Max('min_price'),
+        **{f'delivery_{bound}': Count(
+            'pk', distinct=True, filter=Q(min_delivery_time__lte=bound))
+           for bound in DELIVERY_BUCKETS},
+        **{f'offer_type_{offer_type}': Count(
+            'pk', distinct=True, filter=Q(offer_details__offer_type=offer_type))
+           for offer_type in OFFER_TYPES})
+    return {
+        'count': totals['count'],
+        'price': _get_price_facet(
+            queryset, totals['low'], totals['high'], buckets),
+        'delivery_time': [
+            {'max_delivery_time': bound, 'count': totals[f'delivery_{bound}']}
+            for bound in DELIVERY_BUCKETS],
+        'offer_types': {offer_type: totals[f'offer_type_{offer_type}']
+                        for offer_type in OFFER_TYPES},
+    }
+
+
+def _get_price_facet(queryset, low, high, buckets):
+    """Return the price range and a histogram of the offer min prices."""
+    if low is None:
+        return {'min': None, 'max': None, 'histogram': []}
+    if low == high:
+        buckets = 1
+    width = (high - low) / buckets
+    # Prices on a bound belong to the upper bucket, the maximum to the last
+    bucket = Case(
+        *[When(min_price__lt=low + width * (index + 1), then=Value(index))
+          for index in range(buckets - 1)],
+        default=Value(buckets - 1),
+        output_field=IntegerField())
+    rows = (queryset.filter(min_price__isnull=False)
+            .annotate(price_bucket=bucket)
+            .values('price_bucket')
+            .annotate(count=Count('pk', distinct=True))
+            .values_list('price_bucket', 'count'))
+    counts = dict(rows)
+    histogram = [
+        {'min': (low + width * index).quantize(CENT),
+         'max': (low + width * (index + 1)).quantize(CENT)
+         if index < buckets - 1 else high,
+         'count': counts.get(index, 0)}
+        for index in range(buckets)]
+    return {'min': low, 'max': high, 'histogram': histogram}
+
+
+def parse_bucket_count(value):
+    """Return the requested number of price buckets within the limits."""
+    try:
+        buckets = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_PRICE_BUCKETS
+    return max(1, min(buckets, MAX_PRICE_BUCKETS))
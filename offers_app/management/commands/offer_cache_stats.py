@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from offers_app import cache as offer_cache
+
+
+class Command(BaseCommand):
+    """
+    Show the hit/miss counters of the offer catalog response cache.
+    """
+    help = 'Show (and optionally reset) the offer catalog cache counters.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Reset the counters after printing them.')
+
+    def handle(self, *args, **options):
+        stats = offer_cache.get_stats()
+        hits = stats[offer_cache.HIT_COUNTER]
+        misses = stats[offer_cache.MISS_COUNTER]
+        total = hits + misses
+        hit_rate = (hits / total * 100) if total else 0.0
+        self.stdout.write(f'Hits:     {hits}')
+        self.stdout.write(f'Misses:   {misses}')
+        self.stdout.write(f'Hit rate: {hit_rate:.1f}%')
+        if options['reset']:
+            offer_cache.reset_stats()
+            self.stdout.write(self.style.SUCCESS('Counters reset.'))
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Min, OuterRef, Subquery
+from offers_app.models import Offer, OfferDetail
+
+
+class Command(BaseCommand):
+    """
+    Backfill or verify the denormalized min_price / min_delivery_time columns.
+
+    Without options the columns of all offers are recalculated from their
+    details in a single UPDATE statement. With --verify nothing is written,
+    offers whose stored values differ from their details are reported and
+    the command fails if any were found.
+    """
+    help = 'Backfill or verify Offer.min_price and Offer.min_delivery_time.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Only report offers with out-of-date values, do not write.')
+
+    def handle(self, *args, **options):
+        if options['verify']:
+            self._verify()
+        else:
+            self._backfill()
+
+    def _backfill(self):
+        """Recalculate the columns of all offers."""
+        details = OfferDetail.objects.filter(offer=OuterRef('pk')).values('offer')
+        with transaction.atomic():
+            updated = Offer.objects.update(
+                min_price=Subquery(
+                    details.annotate(value=Min('price')).values('value')),
+                min_delivery_time=Subquery(
+                    details.annotate(value=Min('delivery_time_in_days'))
+                    .values('value')),
+            )
+        self.stdout.write(self.style.SUCCESS(f'Updated {updated} offers.'))
+
+    def _verify(self):
+        """Report offers whose stored values differ from their details."""
+        rows = (Offer.objects
+                .annotate(calculated_min_price=Min('offer_details__price'),
+                          calculated_min_delivery=Min(
+                              'offer_details__delivery_time_in_days'))
+                .values_list('id', 'min_price', 'min_delivery_time',
+                             'calculated_min_price', 'calculated_min_delivery')
+                .order_by('id'))
+        mismatches = 0
+        for offer_id, price, delivery, expected_price, expected_delivery in rows:
+            if price != expected_price or delivery != expected_delivery:
+                mismatches += 1
+                self.stdout.write(
+                    f'Offer {offer_id}: stored ({price}, {delivery}), '
+                    f'expected ({expected_price}, {expected_delivery})')
+        if mismatches:
+            raise CommandError(
+                f'{mismatches} offers are out of date. '
+                'Run the command without --verify to fix them.')
+        self.stdout.write(self.style.SUCCESS('All offers are up to date.'))
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.3 on 2026-10-18 06:10
+
+from django.db import OperationalError, migrations, transaction
+
+FTS_TABLE = 'offers_offer_fts'
+POSTGRES_INDEX = 'offers_offer_search_idx'
+
+
+def create_search_index(apps, schema_editor):
+    """Create the FTS5 table on SQLite or a GIN index on PostgreSQL."""
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute(
+            f"CREATE INDEX {POSTGRES_INDEX} ON offers_offer USING GIN ("
+            "to_tsvector('simple', coalesce(title, '') || ' ' || "
+            "coalesce(description, '')))")
+    elif connection.vendor == 'sqlite':
+        try:
+            with transaction.atomic(using=connection.alias):
+                schema_editor.execute(
+                    f'CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5('
+                    "title, description, tokenize = 'unicode61 remove_diacritics 2')")
+        except OperationalError:
+            # SQLite was built without FTS5, search falls back to LIKE
+            return
+        schema_editor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, description) '
+            "SELECT id, title, coalesce(description, '') FROM offers_offer")
+
+
+def drop_search_index(apps, schema_editor):
+    """Remove the FTS5 table or the GIN index."""
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {POSTGRES_INDEX}')
+    elif connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0002_offer_min_values'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.3 on 2026-10-18 06:53
+
+from django.core.files.storage import default_storage
+from django.db import migrations, models
+from core.image_variants import get_variant_names, get_widths
+
+
+def backfill_variants_ready(apps, schema_editor):
+    """Mark the images whose variants were already generated."""
+    Offer = apps.get_model('offers_app', 'Offer')
+    width = get_widths()[-1]
+    names = (Offer.objects.exclude(file='').exclude(file__isnull=True)
+             .values_list('file', flat=True).distinct())
+    ready = [name for name in names
+             if default_storage.exists(get_variant_names(name, width)['webp'])]
+    for start in range(0, len(ready), 500):
+        Offer.objects.filter(file__in=ready[start:start + 500]).update(
+            variants_ready=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0003_offer_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='variants_ready',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(backfill_variants_ready, migrations.RunPython.noop),
+    ]
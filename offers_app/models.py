@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import User
+from core.image_variants import clear_variants_ready
 
 
 class Offer(models.Model):
@@ -9,12 +10,21 @@ class Offer(models.Model):
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='offers')
     title = models.CharField(max_length=255)
     file = models.ImageField(upload_to='offers/', blank=True, null=True)
+    # Set once the resized variants of the image exist
+    variants_ready = models.BooleanField(default=False)
     description = models.TextField(blank=True, default='')
     price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    # Denormalized from the offer details, kept in sync by update_min_values()
+    min_price = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, blank=True, db_index=True)
+    min_delivery_time = models.IntegerField(null=True, blank=True, db_index=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Image name as loaded, used to clean up the variants of replaced images
+    _loaded_file = None
+
     class Meta:
         db_table = 'offers_offer'
         ordering = ['-created_at']
@@ -22,21 +32,47 @@ class Offer(models.Model):
     def __str__(self):
         return self.title
 
-    @property
-    def min_price(self):
-        """Return the minimum price from offer details."""
-        if self.offer_details.exists():
-            return self.offer_details.aggregate(
-                min_price=models.Min('price'))['min_price']
-        return None
-
-    @property
-    def min_delivery_time(self):
-        """Return the minimum delivery time from offer details."""
-        if self.offer_details.exists():
-            return self.offer_details.aggregate(
-                min_time=models.Min('delivery_time_in_days'))['min_time']
-        return None
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded image name to detect replaced images."""
+        instance = super().from_db(db, field_names, values)
+        if 'file' in instance.__dict__:
+            instance._loaded_file = instance.__dict__['file'] or ''
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Save the row, a new image has no variants yet."""
+        kwargs['update_fields'] = clear_variants_ready(
+            self, kwargs.get('update_fields'))
+        super().save(*args, **kwargs)
+
+    def update_min_values(self, save=True):
+        """
+        Recalculate the minimum price and delivery time from offer details.
+
+        Must be called whenever the offer details are written so that
+        listing, filtering and ordering can read plain columns.
+        """
+        values = self.offer_details.aggregate(
+            min_price=models.Min('price'),
+            min_delivery_time=models.Min('delivery_time_in_days'))
+        self.min_price = values['min_price']
+        self.min_delivery_time = values['min_delivery_time']
+        if save:
+            self.save(update_fields=[
+                'min_price', 'min_delivery_time', 'updated_at'])
+
+    def set_min_values(self, details):
+        """
+        Set the minimum price and delivery time from OfferDetail instances.
+
+        Used by the serializers, which already hold the final details in
+        memory, to avoid an aggregate query. Nothing is saved.
+        """
+        details = list(details)
+        self.min_price = min((d.price for d in details), default=None)
+        self.min_delivery_time = min(
+            (d.delivery_time_in_days for d in details), default=None)
 
 
 class OfferDetail(models.Model):
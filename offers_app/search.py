@@ -0,0 +1,104 @@
+"""
+Full-text search over offer titles and descriptions.
+
+On SQLite the offers are indexed in the FTS5 shadow table ``offers_offer_fts``
+which is kept current by the signal handlers in ``offers_app.signals``.
+On PostgreSQL a GIN expression index over a tsvector of title and
+description is used, which the database keeps current by itself. Other
+databases (or SQLite builds without FTS5) fall back to icontains lookups.
+"""
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'offers_offer_fts'
+MAX_SEARCH_TERMS = 10
+
+POSTGRES_VECTOR = (
+    "to_tsvector('simple', coalesce(offers_offer.title, '') || ' ' || "
+    "coalesce(offers_offer.description, ''))")
+
+_WORD_RE = re.compile(r'\w+')
+_fts_tables = {}
+
+
+def get_search_terms(text):
+    """Split a search string into lower-cased word tokens."""
+    return _WORD_RE.findall(text.lower())[:MAX_SEARCH_TERMS]
+
+
+def has_fts_table():
+    """Check whether the SQLite FTS5 table exists in the current database."""
+    if connection.vendor != 'sqlite':
+        return False
+    name = str(connection.settings_dict['NAME'])
+    if name not in _fts_tables:
+        _fts_tables[name] = FTS_TABLE in connection.introspection.table_names()
+    return _fts_tables[name]
+
+
+def search_offers(queryset, text, with_rank=False):
+    """
+    Filter an offer queryset to offers matching all words of ``text``.
+
+    Every word is matched as a prefix, so partial input while typing finds
+    results. With ``with_rank`` the queryset is annotated with
+    ``search_rank`` where higher values mean more relevant offers.
+    """
+    terms = get_search_terms(text)
+    if not terms:
+        return queryset.none()
+
+    if connection.vendor == 'postgresql':
+        query = ' & '.join(f'{term}:*' for term in terms)
+        queryset = queryset.filter(RawSQL(
+            f"{POSTGRES_VECTOR} @@ to_tsquery('simple', %s)", [query],
+            output_field=BooleanField()))
+        if with_rank:
+            queryset = queryset.annotate(search_rank=RawSQL(
+                f"ts_rank({POSTGRES_VECTOR}, to_tsquery('simple', %s))",
+                [query], output_field=FloatField()))
+        return queryset
+
+    if has_fts_table():
+        query = ' '.join(f'"{term}"*' for term in terms)
+        queryset = queryset.filter(id__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            [query]))
+        if with_rank:
+            # bm25() returns lower values for better matches
+            queryset = queryset.annotate(search_rank=RawSQL(
+                f'SELECT -bm25({FTS_TABLE}) FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s AND rowid = offers_offer.id',
+                [query], output_field=FloatField()))
+        return queryset
+
+    for term in terms:
+        queryset = queryset.filter(
+            Q(title__icontains=term) | Q(description__icontains=term))
+    if with_rank:
+        queryset = queryset.annotate(
+            search_rank=Value(0.0, output_field=FloatField()))
+    return queryset
+
+
+def index_offer(offer):
+    """Insert or refresh an offer in the FTS5 table."""
+    if not has_fts_table():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [offer.pk])
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, description) '
+            'VALUES (%s, %s, %s)',
+            [offer.pk, offer.title, offer.description or ''])
+
+
+def unindex_offer(offer_id):
+    """Remove an offer from the FTS5 table."""
+    if not has_fts_table():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [offer_id])
@@ -0,0 +1,72 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from .models import Offer, OfferDetail
+from . import search
+from core.image_variants import handle_deleted_image, handle_saved_image
+from .cache import bump_catalog_version
+
+
+@receiver(post_save, sender=Offer)
+def index_saved_offer(sender, instance, update_fields=None, **kwargs):
+    """Keep the search index current when an offer is saved."""
+    if update_fields is not None and not {'title', 'description'} & set(update_fields):
+        return
+    search.index_offer(instance)
+
+
+@receiver(post_delete, sender=Offer)
+def unindex_deleted_offer(sender, instance, **kwargs):
+    """Remove deleted offers from the search index."""
+    search.unindex_offer(instance.pk)
+
+
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+# Offers embed the rating summary of their owner
+@receiver(post_save, sender='reviews_app.Review')
+@receiver(post_delete, sender='reviews_app.Review')
+def invalidate_catalog_cache(sender, **kwargs):
+    """Invalidate cached catalog pages once the write is committed."""
+    transaction.on_commit(bump_catalog_version)
+
+
+@receiver(post_save, sender=User)
+def invalidate_catalog_cache_for_owner(sender, instance, update_fields=None, **kwargs):
+    """Offers embed owner details, so user changes invalidate the catalog."""
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    transaction.on_commit(bump_catalog_version)
+
+
+@receiver(post_save, sender=Offer)
+def generate_offer_image_variants(sender, instance, update_fields=None, **kwargs):
+    """Create thumbnails of a new offer image in the background."""
+    offer_id = instance.pk
+    name = instance.file.name if instance.file else ''
+    handle_saved_image(
+        instance, update_fields,
+        on_done=lambda: offer_image_variants_done(offer_id, name))
+
+
+def offer_image_variants_done(offer_id, name):
+    """
+    Mark the variants of the offer image as ready.
+
+    The variants are part of the offer response, bumping ``updated_at``
+    changes its ETag and Last-Modified so clients do not keep a copy
+    without them. Rows whose image was replaced meanwhile are skipped.
+    """
+    if Offer.objects.filter(pk=offer_id, file=name, variants_ready=False).update(
+            variants_ready=True, updated_at=timezone.now()):
+        bump_catalog_version()
+
+
+@receiver(post_delete, sender=Offer)
+def delete_offer_image_variants(sender, instance, **kwargs):
+    """Remove the thumbnails of a deleted offer."""
+    handle_deleted_image(instance)
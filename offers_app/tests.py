@@ -0,0 +1,49 @@
+from decimal import Decimal
+
+from django.test import TestCase
+from orders_app.tests import create_user
+from .facets import get_offer_facets
+from .models import Offer, OfferDetail
+
+
+class OfferFacetTests(TestCase):
+    """Facets are counted by the database in two queries."""
+
+    def setUp(self):
+        owner, _ = create_user('business', 'business')
+        for title, details in (
+                ('Logo', [('basic', '50.00', 2), ('basic', '80.00', 4)]),
+                ('Website', [('basic', '100.00', 7), ('premium', '400.00', 5)]),
+                ('Flyer', [('standard', '20.00', 1)])):
+            offer = Offer.objects.create(owner=owner, title=title)
+            for offer_type, price, days in details:
+                OfferDetail.objects.create(
+                    offer=offer, title=offer_type, offer_type=offer_type,
+                    price=price, delivery_time_in_days=days)
+            offer.update_min_values()
+
+    def test_facets_take_two_queries(self):
+        with self.assertNumQueries(2):
+            facets = get_offer_facets(Offer.objects.all(), buckets=2)
+
+        self.assertEqual(facets['count'], 3)
+        # Offers are counted once per type, even with two basic details
+        self.assertEqual(facets['offer_types'],
+                         {'basic': 2, 'standard': 1, 'premium': 1})
+        self.assertEqual(facets['delivery_time'], [
+            {'max_delivery_time': 1, 'count': 1},
+            {'max_delivery_time': 3, 'count': 2},
+            {'max_delivery_time': 7, 'count': 3},
+            {'max_delivery_time': 14, 'count': 3},
+            {'max_delivery_time': 30, 'count': 3}])
+        price = facets['price']
+        self.assertEqual((price['min'], price['max']),
+                         (Decimal('20.00'), Decimal('100.00')))
+        self.assertEqual([bucket['count'] for bucket in price['histogram']], [2, 1])
+
+    def test_facets_of_a_filtered_queryset(self):
+        facets = get_offer_facets(Offer.objects.filter(min_price__gte=50))
+
+        self.assertEqual(facets['count'], 2)
+        self.assertEqual(facets['offer_types'],
+                         {'basic': 2, 'standard': 0, 'premium': 1})
@@ -1,14 +1,24 @@
 from django.contrib import admin
-from .models import Order
+from .models import BusinessOrderStats, Order
 
 
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
-    list_display = ['id', 'customer', 'offer_title', 'status', 'created_at']
+    list_display = ['id', 'customer', 'business_user', 'offer_title', 'status', 'created_at']
     list_filter = ['status', 'created_at']
     search_fields = ['customer__username', 'offer_detail__offer__title']
 
     def offer_title(self, obj):
         """Return offer title for admin display."""
+        if obj.offer_detail is None:
+            # The offer detail was removed, only the snapshot is left
+            return obj.title
         return obj.offer_detail.offer.title
     offer_title.short_description = 'Offer Title'
+
+
+@admin.register(BusinessOrderStats)
+class BusinessOrderStatsAdmin(admin.ModelAdmin):
+    list_display = ['business_user', 'pending', 'in_progress', 'completed', 'cancelled']
+    readonly_fields = ['business_user', 'pending', 'in_progress', 'completed', 'cancelled']
+    search_fields = ['business_user__username']
@@ -9,8 +9,8 @@ class IsOrderRelatedUser(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         """Check if user has object permission."""
         # User is either the customer or the business owner
-        return (obj.customer == request.user or
-                obj.offer_detail.offer.owner == request.user)
+        return (obj.customer_id == request.user.id or
+                obj.business_user_id == request.user.id)
 
 
 class IsBusinessOwner(permissions.BasePermission):
@@ -21,7 +21,7 @@ class IsBusinessOwner(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         """Check if user has object permission."""
         # User is the business owner of the offer
-        return obj.offer_detail.offer.owner == request.user
+        return obj.business_user_id == request.user.id
 
 
 class IsAdminOrOrderRelatedUser(permissions.BasePermission):
@@ -41,8 +41,8 @@ class IsAdminOrOrderRelatedUser(permissions.BasePermission):
             return True
 
         # User is either the customer or the business owner
-        return (obj.customer == request.user or
-                obj.offer_detail.offer.owner == request.user)
+        return (obj.customer_id == request.user.id or
+                obj.business_user_id == request.user.id)
 
 
 class IsAdminOrBusinessOwner(permissions.BasePermission):
@@ -57,4 +57,4 @@ class IsAdminOrBusinessOwner(permissions.BasePermission):
             return True
 
         # User is the business owner of the offer
-        return obj.offer_detail.offer.owner == request.user
+        return obj.business_user_id == request.user.id
@@ -0,0 +1,62 @@
+"""
+Fast read path for order lists.
+
+``serialize_orders`` produces the same output as ``OrderSerializer`` with
+``many=True`` but reads only the needed columns of the order table with
+one ``values()`` query and builds the dicts directly, without creating model
+instances or serializer fields per order.
+"""
+from rest_framework import serializers
+
+ORDER_COLUMNS = (
+    'id',
+    'customer_id',
+    'status',
+    'created_at',
+    'updated_at',
+    'offer_detail_id',
+    'title',
+    'revisions',
+    'delivery_time_in_days',
+    'price',
+    'features',
+    'offer_type',
+    'business_user_id',
+)
+
+# Field instances used for formatting only, they match OrderSerializer
+_price_field = serializers.DecimalField(max_digits=10, decimal_places=2)
+_datetime_field = serializers.DateTimeField()
+
+
+def serialize_order_row(row):
+    """Build the representation of one order from a row of ORDER_COLUMNS."""
+    price = row['price']
+    return {
+        'id': row['id'],
+        'customer_user': row['customer_id'],
+        'offer_detail': {
+            'id': row['offer_detail_id'],
+            'title': row['title'],
+            'revisions': row['revisions'],
+            'delivery_time_in_days': row['delivery_time_in_days'],
+            'price': _price_field.to_representation(price),
+            'features': row['features'],
+            'offer_type': row['offer_type'],
+        },
+        'business_user': row['business_user_id'],
+        'title': row['title'],
+        'revisions': row['revisions'],
+        'delivery_time_in_days': row['delivery_time_in_days'],
+        'price': price,
+        'features': row['features'],
+        'offer_type': row['offer_type'],
+        'status': row['status'],
+        'created_at': _datetime_field.to_representation(row['created_at']),
+        'updated_at': _datetime_field.to_representation(row['updated_at']),
+    }
+
+
+def serialize_orders(queryset):
+    """Return the representations of all orders of a queryset in its order."""
+    return [serialize_order_row(row) for row in queryset.values(*ORDER_COLUMNS)]
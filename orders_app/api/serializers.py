@@ -1,24 +1,40 @@
 from rest_framework import serializers
+from rest_framework.exceptions import PermissionDenied
 from ..models import Order
 from offers_app.models import OfferDetail
-from offers_app.api.serializers import OfferDetailSerializer
+
+
+class OrderOfferDetailSerializer(serializers.Serializer):
+    """
+    Offer detail of an order, read from the snapshot on the order row.
+    """
+    id = serializers.IntegerField(source='offer_detail_id')
+    title = serializers.CharField()
+    revisions = serializers.IntegerField()
+    delivery_time_in_days = serializers.IntegerField()
+    price = serializers.DecimalField(max_digits=10, decimal_places=2)
+    features = serializers.JSONField()
+    offer_type = serializers.CharField()
 
 
 class OrderSerializer(serializers.ModelSerializer):
     """
     Serializer for Order model.
+
+    All offer data comes from the snapshot taken when the order was placed,
+    no offer tables are read.
     """
     customer_user = serializers.SerializerMethodField()
-    offer_detail = OfferDetailSerializer(read_only=True)
+    offer_detail = OrderOfferDetailSerializer(source='*', read_only=True)
     business_user = serializers.SerializerMethodField()
 
-    # Flattened fields from offer_detail
-    title = serializers.SerializerMethodField()
-    revisions = serializers.SerializerMethodField()
-    delivery_time_in_days = serializers.SerializerMethodField()
-    price = serializers.SerializerMethodField()
-    features = serializers.SerializerMethodField()
-    offer_type = serializers.SerializerMethodField()
+    # Flattened fields from the offer detail snapshot
+    title = serializers.ReadOnlyField()
+    revisions = serializers.ReadOnlyField()
+    delivery_time_in_days = serializers.ReadOnlyField()
+    price = serializers.ReadOnlyField()
+    features = serializers.ReadOnlyField()
+    offer_type = serializers.ReadOnlyField()
 
     class Meta:
         model = Order
@@ -51,35 +67,11 @@ class OrderSerializer(serializers.ModelSerializer):
 
     def get_customer_user(self, obj):
         """Return the customer's ID as 'customer_user' field."""
-        return obj.customer.id
+        return obj.customer_id
 
     def get_business_user(self, obj):
         """Return the business user's ID as 'business_user' field."""
-        return obj.business_user.id
-
-    def get_title(self, obj):
-        """Return the offer detail title."""
-        return obj.offer_detail.title
-
-    def get_revisions(self, obj):
-        """Return the offer detail revisions."""
-        return obj.offer_detail.revisions
-
-    def get_delivery_time_in_days(self, obj):
-        """Return the offer detail delivery time."""
-        return obj.offer_detail.delivery_time_in_days
-
-    def get_price(self, obj):
-        """Return the offer detail price."""
-        return obj.offer_detail.price
-
-    def get_features(self, obj):
-        """Return the offer detail features."""
-        return obj.offer_detail.features
-
-    def get_offer_type(self, obj):
-        """Return the offer detail type."""
-        return obj.offer_detail.offer_type
+        return obj.business_user_id
 
 
 class OrderCreateSerializer(serializers.ModelSerializer):
@@ -93,29 +85,30 @@ class OrderCreateSerializer(serializers.ModelSerializer):
         fields = ['offer_detail_id']
 
     def validate_offer_detail_id(self, value):
-        """Validate offer detail ID."""
-        try:
-            offer_detail = OfferDetail.objects.get(id=value)
-            # Check authorization within the serializer
-            user = self.context['request'].user
-            
-            # Check if customer is trying to order their own service
-            if offer_detail.offer.owner == user:
-                from rest_framework.exceptions import PermissionDenied
-                raise PermissionDenied("You cannot order your own service.")
-                
-            return value
-        except OfferDetail.DoesNotExist:
+        """
+        Validate offer detail ID.
+
+        The offer detail is loaded once together with its offer and kept
+        for ``create``.
+        """
+        offer_detail = (OfferDetail.objects.select_related('offer')
+                        .filter(id=value).first())
+        if offer_detail is None:
             raise serializers.ValidationError("Offer detail not found.")
 
-    def create(self, validated_data):
-        """Create new order."""
-        offer_detail = OfferDetail.objects.get(id=validated_data['offer_detail_id'])
+        # Check if customer is trying to order their own service
+        if offer_detail.offer.owner_id == self.context['request'].user.id:
+            raise PermissionDenied("You cannot order your own service.")
+
+        self._offer_detail = offer_detail
+        return value
 
-        return Order.objects.create(
-            customer=self.context['request'].user,
-            offer_detail=offer_detail
-        )
+    def create(self, validated_data):
+        """Create new order with a snapshot of the offer detail."""
+        order = Order(customer=self.context['request'].user)
+        order.copy_offer_detail(self._offer_detail)
+        order.save()
+        return order
 
 
 class OrderStatusUpdateSerializer(serializers.ModelSerializer):
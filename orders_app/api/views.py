@@ -2,26 +2,52 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.generics import (
     ListCreateAPIView, RetrieveUpdateDestroyAPIView
 )
+from datetime import datetime, time
 from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from core.authentication import get_profile_type
+from core.conditional import ConditionalGetMixin
+from core.idempotency import IdempotentCreateMixin
+from core.pagination import CursorPaginationMixin, KeysetPagination
 from ..models import Order
 from .serializers import (
     OrderSerializer, OrderCreateSerializer, OrderStatusUpdateSerializer
 )
+from .readers import ORDER_COLUMNS, serialize_order_row, serialize_orders
+from ..transitions import check_transition_access, transition_order
 from .permissions import (
     IsAdminOrOrderRelatedUser, IsAdminOrBusinessOwner
 )
 
 
-class OrderListCreateView(ListCreateAPIView):
+class OrderCursorPagination(KeysetPagination):
+    """Keyset pagination for the order list, opt-in via ``?cursor=``."""
+    orderings = ('-created_at', 'created_at')
+
+
+class OrderListCreateView(IdempotentCreateMixin, CursorPaginationMixin,
+                          ListCreateAPIView):
     """
     List orders or create a new order.
+
+    The list contains the orders the user placed as customer and received
+    as business user. Both sides are read with separate index-backed
+    queries (customer, created_at) and (business_user, created_at) that
+    are combined as a UNION instead of an OR across both columns.
+    ``role``, ``status``, ``created_after`` and ``created_before`` filter
+    the list, requests with a ``cursor`` parameter are keyset paginated.
+    Creation honors the Idempotency-Key header.
     """
     permission_classes = [IsAuthenticated]
     pagination_class = None  # Disable pagination
+    cursor_pagination_class = OrderCursorPagination
+    idempotency_scope = 'orders'
+    roles = ('customer', 'business')
 
     def get_serializer_class(self):
         """Return appropriate serializer class."""
@@ -30,13 +56,82 @@ class OrderListCreateView(ListCreateAPIView):
         return OrderSerializer
 
     def get_queryset(self):
-        """Return filtered queryset."""
+        """Return the orders of the user as one queryset."""
+        branches = self.get_branch_querysets()
+        if len(branches) == 1:
+            return branches[0]
+        ids = [branch.order_by().values('pk') for branch in branches]
+        return Order.objects.filter(pk__in=ids[0].union(*ids[1:]))
+
+    def get_branch_querysets(self):
+        """Return one filtered queryset per requested role."""
         user = self.request.user
-        # Return orders where user is either customer or business owner
-        return (Order.objects.filter(
-            Q(customer=user) | Q(offer_detail__offer__owner=user)
-        ).select_related('customer', 'offer_detail__offer__owner')
-         .prefetch_related('offer_detail'))
+        role = self._get_role()
+        filters = self._get_filters()
+        branches = []
+        if role in (None, 'customer'):
+            branches.append(Order.objects.filter(customer=user, **filters))
+        if role in (None, 'business'):
+            branches.append(Order.objects.filter(business_user=user, **filters))
+        return branches
+
+    def list(self, request, *args, **kwargs):
+        """List orders through the flat read path."""
+        paginator = self.paginator
+        if paginator is None:
+            queryset = self.filter_queryset(self.get_queryset())
+            return Response(serialize_orders(queryset))
+
+        branches = [branch.values(*ORDER_COLUMNS)
+                    for branch in self.get_branch_querysets()]
+        rows = paginator.paginate_union(branches, request, view=self)
+        return paginator.get_paginated_response(
+            [serialize_order_row(row) for row in rows])
+
+    def _get_role(self):
+        """Return the requested role or None for both."""
+        role = self.request.query_params.get('role')
+        if not role:
+            return None
+        if role not in self.roles:
+            raise ValidationError(
+                {'role': f"Must be one of: {', '.join(self.roles)}."})
+        return role
+
+    def _get_filters(self):
+        """Return the lookups for the status and created_at filters."""
+        params = self.request.query_params
+        filters = {}
+        order_status = params.get('status')
+        if order_status:
+            choices = [value for value, _ in Order.STATUS_CHOICES]
+            if order_status not in choices:
+                raise ValidationError(
+                    {'status': f"Must be one of: {', '.join(choices)}."})
+            filters['status'] = order_status
+        for param, lookup in (('created_after', 'created_at__gte'),
+                              ('created_before', 'created_at__lt')):
+            value = params.get(param)
+            if value:
+                filters[lookup] = self._parse_datetime(param, value)
+        return filters
+
+    def _parse_datetime(self, param, value):
+        """Parse an ISO 8601 date or datetime, dates mean midnight."""
+        try:
+            parsed = parse_datetime(value)
+            if parsed is None:
+                date = parse_date(value)
+                if date is not None:
+                    parsed = datetime.combine(date, time.min)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise ValidationError(
+                {param: 'Expected an ISO 8601 date or datetime.'})
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
 
     def create(self, request, *args, **kwargs):
         """Override create to handle permissions and validation properly."""
@@ -45,7 +140,7 @@ class OrderListCreateView(ListCreateAPIView):
             raise PermissionDenied("Authentication required to create orders.")
             
         # Then check user type permissions BEFORE data validation
-        if not hasattr(request.user, 'profile') or request.user.profile.type != 'customer':
+        if get_profile_type(request.user) != 'customer':
             raise PermissionDenied("Only customer users can create orders.")
         
         # Now validate the data (this should return 400 for bad data)
@@ -69,14 +164,47 @@ class OrderListCreateView(ListCreateAPIView):
         serializer.save()
 
 
-class OrderDetailView(RetrieveUpdateDestroyAPIView):
+class OrderStatusChangeMixin:
+    """
+    Change the status of an order through the status state machine.
+
+    The body is validated first, the transition itself is a single
+    conditional UPDATE (see orders_app.transitions).
+    """
+
+    def change_status(self, request, pk):
+        """Apply the requested status and return the order representation."""
+        serializer = OrderStatusUpdateSerializer(data=request.data, partial=True)
+        if not serializer.is_valid():
+            # Report missing orders and permissions before invalid data
+            check_transition_access(pk, request.user)
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        target = serializer.validated_data.get('status')
+        if target is None:
+            check_transition_access(pk, request.user)
+        else:
+            transition_order(pk, target, request.user)
+        return Response(serialize_orders(Order.objects.filter(pk=pk))[0])
+
+
+class OrderDetailView(OrderStatusChangeMixin, ConditionalGetMixin,
+                      RetrieveUpdateDestroyAPIView):
     """
     Retrieve, update or delete an order.
     """
-    queryset = (Order.objects.all()
-                .select_related('customer', 'offer_detail__offer__owner')
-                .prefetch_related('offer_detail'))
+    queryset = Order.objects.all()
     serializer_class = OrderSerializer
+    last_modified_fields = ('updated_at',)
+
+    def get_validator_queryset(self):
+        """Limit conditional requests to orders the user may view."""
+        queryset = super().get_validator_queryset()
+        user = self.request.user
+        if user.is_staff or user.is_superuser:
+            return queryset
+        return queryset.filter(
+            Q(customer=user) | Q(business_user=user))
 
     def get_permissions(self):
         """Return appropriate permissions."""
@@ -90,6 +218,16 @@ class OrderDetailView(RetrieveUpdateDestroyAPIView):
             # Anyone related to the order can view it
             return [IsAuthenticated(), IsAdminOrOrderRelatedUser()]
 
+    def update(self, request, *args, **kwargs):
+        """Update the order, only the status can be changed."""
+        try:
+            return self.change_status(request, kwargs['pk'])
+        except Order.DoesNotExist:
+            from rest_framework.exceptions import NotFound
+            raise NotFound("Order not found.")
+        except PermissionDenied:
+            raise PermissionDenied("You do not have permission to access this order.")
+
     def get_object(self):
         """Get object and handle permissions properly."""
         try:
@@ -104,7 +242,7 @@ class OrderDetailView(RetrieveUpdateDestroyAPIView):
             raise PermissionDenied("You do not have permission to access this order.")
 
 
-class OrderStatusUpdateView(APIView):
+class OrderStatusUpdateView(OrderStatusChangeMixin, APIView):
     """
     Update order status.
     """
@@ -113,20 +251,8 @@ class OrderStatusUpdateView(APIView):
     def patch(self, request, pk):
         """Update order status."""
         try:
-            order = Order.objects.get(pk=pk)
-            self.check_object_permissions(request, order)
-
-            return self._update_order_status(order, request.data)
+            return self.change_status(request, pk)
         except Order.DoesNotExist:
             return Response({
                 'error': 'Order not found'
             }, status=status.HTTP_404_NOT_FOUND)
-
-    def _update_order_status(self, order, data):
-        """Update order status and return response."""
-        serializer = OrderStatusUpdateSerializer(order, data=data, partial=True)
-        if serializer.is_valid():
-            serializer.save()
-            response_serializer = OrderSerializer(order)
-            return Response(response_serializer.data)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
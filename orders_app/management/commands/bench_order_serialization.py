@@ -0,0 +1,83 @@
+import time
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from offers_app.models import Offer, OfferDetail
+from orders_app.api.readers import serialize_orders
+from orders_app.api.serializers import OrderSerializer
+from orders_app.models import Order
+
+
+class Command(BaseCommand):
+    """
+    Compare OrderSerializer with the flat order reader on a large order list.
+
+    Temporary users, an offer and the orders are created inside a
+    transaction that is rolled back afterwards, so the database is left
+    unchanged. Both paths run against the same queryset as the order list
+    view, the rendered JSON is compared byte for byte and the time per order
+    is reported.
+    """
+    help = 'Benchmark order list serialization (ModelSerializer vs. reader).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--orders', type=int, default=10000,
+            help='Number of orders to create (default: 10000).')
+        parser.add_argument(
+            '--repeat', type=int, default=3,
+            help='Runs per path, the fastest one is reported (default: 3).')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            queryset = self._create_orders(options['orders'])
+            model_time, model_output = self._measure(
+                options['repeat'], lambda: OrderSerializer(
+                    queryset, many=True).data)
+            reader_time, reader_output = self._measure(
+                options['repeat'], lambda: serialize_orders(queryset))
+            transaction.set_rollback(True)
+
+        if model_output != reader_output:
+            raise CommandError('The reader output differs from OrderSerializer.')
+
+        count = options['orders']
+        for label, seconds in (('OrderSerializer', model_time),
+                               ('serialize_orders', reader_time)):
+            self.stdout.write(
+                f'{label:<17} {seconds * 1000:9.1f} ms total, '
+                f'{seconds / count * 1e6:7.1f} us per order')
+        self.stdout.write(self.style.SUCCESS(
+            f'Identical output, reader is {model_time / reader_time:.1f}x faster.'))
+
+    def _create_orders(self, count):
+        """Create a customer, an offer with details and ``count`` orders."""
+        suffix = uuid.uuid4().hex[:8]
+        customer = User.objects.create(username=f'bench-customer-{suffix}')
+        owner = User.objects.create(username=f'bench-business-{suffix}')
+        offer = Offer.objects.create(owner=owner, title='Benchmark offer')
+        details = OfferDetail.objects.bulk_create([
+            OfferDetail(offer=offer, title=offer_type.title(), revisions=index,
+                        delivery_time_in_days=index + 1, price=100 * (index + 1),
+                        features=['Feature A', 'Feature B'], offer_type=offer_type)
+            for index, (offer_type, _) in enumerate(OfferDetail.OFFER_TYPE_CHOICES)])
+        orders = []
+        for index in range(count):
+            order = Order(customer=customer)
+            order.copy_offer_detail(details[index % len(details)])
+            orders.append(order)
+        Order.objects.bulk_create(orders, batch_size=1000)
+        return Order.objects.filter(customer=customer)
+
+    def _measure(self, repeat, serialize):
+        """Return the fastest run time and the rendered JSON of a path."""
+        best = None
+        for _ in range(max(repeat, 1)):
+            start = time.perf_counter()
+            output = JSONRenderer().render(serialize())
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, output
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from orders_app.models import BusinessOrderStats, Order
+
+
+class Command(BaseCommand):
+    """
+    Recalculate the per business order counters from the orders.
+
+    Needed after orders were changed without Order.save(), e.g. by queryset
+    updates, bulk operations or manual database edits.
+    """
+    help = 'Rebuild BusinessOrderStats from the orders table.'
+
+    def handle(self, *args, **options):
+        stats = {}
+        rows = (Order.objects.values_list('business_user_id', 'status')
+                .annotate(count=Count('id')).order_by())
+        for business_user_id, status, count in rows:
+            row = stats.setdefault(
+                business_user_id,
+                BusinessOrderStats(business_user_id=business_user_id))
+            setattr(row, status, count)
+
+        with transaction.atomic():
+            BusinessOrderStats.objects.all().delete()
+            BusinessOrderStats.objects.bulk_create(stats.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt order counters of {len(stats)} business users.'))
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.3 on 2026-10-18 06:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+
+
+def backfill_business_users(apps, schema_editor):
+    """Copy the offer owner onto existing orders and count their orders."""
+    Order = apps.get_model('orders_app', 'Order')
+    OfferDetail = apps.get_model('offers_app', 'OfferDetail')
+    BusinessOrderStats = apps.get_model('orders_app', 'BusinessOrderStats')
+    Order.objects.update(business_user=Subquery(
+        OfferDetail.objects.filter(pk=OuterRef('offer_detail_id'))
+        .values('offer__owner_id')[:1]))
+
+    stats = {}
+    rows = (Order.objects.values_list('business_user_id', 'status')
+            .annotate(count=Count('id')).order_by())
+    for business_user_id, status, count in rows:
+        row = stats.setdefault(
+            business_user_id,
+            BusinessOrderStats(business_user_id=business_user_id))
+        setattr(row, status, count)
+    BusinessOrderStats.objects.bulk_create(stats.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0001_initial'),
+        ('orders_app', '0002_alter_order_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessOrderStats',
+            fields=[
+                ('business_user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='order_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('pending', models.IntegerField(default=0)),
+                ('in_progress', models.IntegerField(default=0)),
+                ('completed', models.IntegerField(default=0)),
+                ('cancelled', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'business order stats',
+                'db_table': 'orders_businessorderstats',
+            },
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='business_user',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='business_orders', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(backfill_business_users, migrations.RunPython.noop),
+    ]
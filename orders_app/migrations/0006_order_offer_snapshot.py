@@ -0,0 +1,65 @@
+# Generated by Django 5.2.3 on 2026-10-18 08:02
+
+from django.db import migrations, models
+
+SNAPSHOT_FIELDS = (
+    'title', 'revisions', 'delivery_time_in_days', 'price', 'features',
+    'offer_type')
+
+
+def backfill_snapshots(apps, schema_editor):
+    """Copy the current offer detail values onto existing orders."""
+    Order = apps.get_model('orders_app', 'Order')
+    batch = []
+    for order in Order.objects.select_related('offer_detail').iterator(chunk_size=1000):
+        for field in SNAPSHOT_FIELDS:
+            setattr(order, field, getattr(order.offer_detail, field))
+        batch.append(order)
+        if len(batch) >= 1000:
+            Order.objects.bulk_update(batch, SNAPSHOT_FIELDS)
+            batch = []
+    Order.objects.bulk_update(batch, SNAPSHOT_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0001_initial'),
+        ('orders_app', '0005_order_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='title',
+            field=models.CharField(default='', max_length=255),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='revisions',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='delivery_time_in_days',
+            field=models.IntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='price',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='features',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='offer_type',
+            field=models.CharField(choices=[('basic', 'Basic'), ('standard', 'Standard'), ('premium', 'Premium')], default='basic', max_length=10),
+        ),
+        migrations.RunPython(backfill_snapshots, migrations.RunPython.noop),
+    ]
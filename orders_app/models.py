@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 from django.contrib.auth.models import User
 from offers_app.models import OfferDetail
 
@@ -13,31 +14,169 @@ class Order(models.Model):
         ('completed', 'Completed'),
         ('cancelled', 'Cancelled'),
     ]
+    # Allowed status changes, see orders_app.transitions
+    STATUS_TRANSITIONS = {
+        'pending': ('in_progress', 'cancelled'),
+        'in_progress': ('completed', 'cancelled'),
+        'completed': (),
+        'cancelled': (),
+    }
 
     customer = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
         related_name='customer_orders')
+    # Orders keep their snapshot when the offer detail is removed
     offer_detail = models.ForeignKey(
         OfferDetail,
-        on_delete=models.CASCADE,
+        on_delete=models.SET_NULL,
+        null=True,
         related_name='orders')
+    # Owner of the ordered offer, copied on creation to avoid joins
+    business_user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='business_orders')
     status = models.CharField(
         max_length=20,
         choices=STATUS_CHOICES,
         default='in_progress')
 
+    # Snapshot of the ordered offer detail, later edits of the offer do not
+    # change existing orders
+    title = models.CharField(max_length=255)
+    revisions = models.IntegerField(default=0)
+    delivery_time_in_days = models.IntegerField(default=1)
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    features = models.JSONField(default=list, blank=True)
+    offer_type = models.CharField(
+        max_length=10,
+        choices=OfferDetail.OFFER_TYPE_CHOICES,
+        default='basic')
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Fields copied from the offer detail when the order is placed
+    SNAPSHOT_FIELDS = (
+        'title', 'revisions', 'delivery_time_in_days', 'price', 'features',
+        'offer_type')
+
+    # Status as loaded from the database, used to update the counters
+    _loaded_status = None
+
     class Meta:
         db_table = 'orders_order'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['customer', 'created_at'],
+                         name='orders_customer_created_idx'),
+            models.Index(fields=['business_user', 'created_at'],
+                         name='orders_business_created_idx'),
+        ]
 
     def __str__(self):
-        return f"Order {self.id} - {self.offer_detail.offer.title} ({self.status})"
+        return f"Order {self.id} - {self.title} ({self.status})"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded status to detect status changes on save."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
+    def copy_offer_detail(self, offer_detail):
+        """
+        Set the offer detail, its snapshot fields and the business user.
+
+        ``offer_detail.offer`` should be loaded with ``select_related``.
+        """
+        self.offer_detail = offer_detail
+        for field in self.SNAPSHOT_FIELDS:
+            setattr(self, field, getattr(offer_detail, field))
+        self.business_user_id = offer_detail.offer.owner_id
+
+    def save(self, *args, **kwargs):
+        """Save the order and keep the business order counters current."""
+        adding = self._state.adding
+        if (adding and self.offer_detail_id is not None
+                and (self.price is None or self.business_user_id is None)):
+            self.copy_offer_detail(OfferDetail.objects.select_related('offer')
+                                   .get(pk=self.offer_detail_id))
+        update_fields = kwargs.get('update_fields')
+        tracks_status = update_fields is None or 'status' in update_fields
+        previous = self._loaded_status
+        if not adding and tracks_status and previous is None:
+            previous = (Order.objects.filter(pk=self.pk)
+                        .values_list('status', flat=True).first())
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                BusinessOrderStats.apply(self.business_user_id, {self.status: 1})
+            elif tracks_status and previous != self.status:
+                BusinessOrderStats.apply(
+                    self.business_user_id, {previous: -1, self.status: 1})
+        if tracks_status:
+            self._loaded_status = self.status
+
+
+class BusinessOrderStats(models.Model):
+    """
+    Number of orders per status of a business user.
+
+    The counters are updated with F() expressions when orders are created,
+    change their status or are deleted. Writes that bypass ``Order.save``
+    (queryset updates, bulk operations) must adjust them explicitly or be
+    followed by the ``rebuild_order_stats`` command.
+    """
+    business_user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='order_stats')
+    pending = models.IntegerField(default=0)
+    in_progress = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+    cancelled = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'orders_businessorderstats'
+        verbose_name_plural = 'business order stats'
+
+    def __str__(self):
+        return f"Order stats of user {self.business_user_id}"
+
+    @classmethod
+    def apply(cls, business_user_id, changes):
+        """
+        Add ``changes`` ({status: delta}) to the counters of a business user.
+
+        The row is created on the first increment. Decrements never create
+        a row, so deleting a business user with orders does not recreate it.
+        """
+        changes = {status: delta for status, delta in changes.items()
+                   if status is not None and delta}
+        if business_user_id is None or not changes:
+            return
+        values = {status: F(status) + delta for status, delta in changes.items()}
+        rows = cls.objects.filter(pk=business_user_id)
+        if rows.update(**values) or not any(d > 0 for d in changes.values()):
+            return
+        cls.objects.get_or_create(business_user_id=business_user_id)
+        rows.update(**values)
+
+    @classmethod
+    def get_count(cls, business_user_id, status):
+        """
+        Return the number of orders of a business user with ``status``.
 
-    @property
-    def business_user(self):
-        """Get the business user who owns the offer."""
-        return self.offer_detail.offer.owner
+        Returns None if the user does not exist.
+        """
+        count = (cls.objects.filter(pk=business_user_id)
+                 .values_list(status, flat=True).first())
+        if count is not None:
+            return count
+        if User.objects.filter(pk=business_user_id).exists():
+            return 0
+        return None
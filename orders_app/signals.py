@@ -0,0 +1,9 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from .models import BusinessOrderStats, Order
+
+
+@receiver(post_delete, sender=Order)
+def update_stats_for_deleted_order(sender, instance, **kwargs):
+    """Remove deleted orders from the business order counters."""
+    BusinessOrderStats.apply(instance.business_user_id, {instance.status: -1})
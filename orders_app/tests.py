@@ -0,0 +1,108 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.test import APITestCase
+from profiles_app.models import Profile
+from .models import BusinessOrderStats, Order
+from .transitions import Conflict, transition_order
+
+DETAILS = [
+    {'title': 'Basic', 'revisions': 1, 'delivery_time_in_days': 5,
+     'price': '100.00', 'features': ['Logo'], 'offer_type': 'basic'},
+    {'title': 'Standard', 'revisions': 2, 'delivery_time_in_days': 3,
+     'price': '200.00', 'features': ['Logo'], 'offer_type': 'standard'},
+    {'title': 'Premium', 'revisions': 3, 'delivery_time_in_days': 1,
+     'price': '300.00', 'features': ['Logo'], 'offer_type': 'premium'},
+]
+
+
+def create_user(username, profile_type):
+    """Create a user with a profile and return the user and its token."""
+    user = User.objects.create_user(username, f'{username}@example.com')
+    Profile.objects.create(user=user, type=profile_type)
+    return user, Token.objects.create(user=user)
+
+
+class OfferDetailRemovalTests(APITestCase):
+    """Orders outlive the offer details they were placed on."""
+
+    def setUp(self):
+        cache.clear()
+        self.business, self.business_token = create_user('business', 'business')
+        self.customer, self.customer_token = create_user('customer', 'customer')
+
+    def authenticate(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    def test_order_survives_put_that_drops_its_tier(self):
+        self.authenticate(self.business_token)
+        response = self.client.post('/api/offers/', {
+            'title': 'Webdesign', 'description': 'Websites', 'details': DETAILS,
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        offer = response.json()
+        premium = next(d for d in offer['details'] if d['offer_type'] == 'premium')
+
+        self.authenticate(self.customer_token)
+        response = self.client.post(
+            '/api/orders/', {'offer_detail_id': premium['id']}, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        order_id = response.json()['id']
+
+        self.authenticate(self.business_token)
+        response = self.client.put(f"/api/offers/{offer['id']}/", {
+            'title': 'Webdesign', 'description': 'Websites', 'details': DETAILS[:2],
+        }, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+
+        order = Order.objects.get(pk=order_id)
+        self.assertIsNone(order.offer_detail_id)
+        self.assertEqual(order.title, 'Premium')
+        self.assertEqual(order.offer_type, 'premium')
+
+        self.authenticate(self.customer_token)
+        response = self.client.get(f'/api/orders/{order_id}/')
+        self.assertEqual(response.status_code, 200, response.content)
+        data = response.json()
+        self.assertIsNone(data['offer_detail']['id'])
+        self.assertEqual(data['offer_detail']['price'], '300.00')
+
+
+class TransitionTests(TestCase):
+    """Status changes lock the order and update it by primary key."""
+
+    def setUp(self):
+        self.business, _ = create_user('business', 'business')
+        customer, _ = create_user('customer', 'customer')
+        self.order = Order.objects.create(
+            customer=customer, business_user=self.business, title='Logo',
+            price='100.00')
+
+    def test_transition_locks_reads_and_updates(self):
+        # Locked SELECT, UPDATE of the order and of the business counters,
+        # plus the SAVEPOINT/RELEASE of the atomic block in the test case
+        with self.assertNumQueries(5) as queries:
+            self.assertTrue(transition_order(self.order.pk, 'completed', self.business))
+
+        update = queries.captured_queries[2]['sql']
+        self.assertTrue(update.startswith('UPDATE "orders_order"'), update)
+        self.assertNotIn('"status" IN', update)
+        stats = BusinessOrderStats.objects.get(pk=self.business.pk)
+        self.assertEqual((stats.in_progress, stats.completed), (0, 1))
+
+    def test_repeated_transition_returns_false(self):
+        transition_order(self.order.pk, 'completed', self.business)
+
+        self.assertFalse(transition_order(self.order.pk, 'completed', self.business))
+        with self.assertRaises(Conflict):
+            transition_order(self.order.pk, 'cancelled', self.business)
+
+    def test_other_business_user_is_denied(self):
+        other, _ = create_user('other', 'business')
+
+        with self.assertRaises(PermissionDenied):
+            transition_order(self.order.pk, 'completed', other)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, 'in_progress')
@@ -0,0 +1,91 @@
+"""
+Order status state machine.
+
+The allowed transitions are listed in ``Order.STATUS_TRANSITIONS``. A
+transition runs two statements in one transaction: a SELECT ... FOR UPDATE
+that locks the order while it has an allowed source status (and, for
+non-staff users, belongs to the requesting business user) and reads that
+status, then an UPDATE of the locked row by primary key. A single
+UPDATE ... RETURNING does not fit, the business order counters need the
+replaced status while RETURNING yields the new values, SQLite cannot
+return the columns of the subquery of an UPDATE ... FROM and MySQL has no
+RETURNING at all.
+
+Concurrent transitions of an order wait for the lock and then find the
+new status, so they can never both succeed, the loser gets a 409
+response. SQLite ignores FOR UPDATE but allows a single writer, the
+transaction whose read became stale fails to write. If the locked SELECT
+finds no row, the order is read once more to tell a missing order, a
+missing permission, a repeated transition and a conflict apart.
+"""
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, PermissionDenied
+from .models import BusinessOrderStats, Order
+
+
+class Conflict(APIException):
+    """The requested status change is not allowed from the current status."""
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'The order status cannot be changed.'
+    default_code = 'conflict'
+
+
+def get_source_statuses(target):
+    """Return the statuses from which ``target`` can be reached."""
+    return [source for source, targets in Order.STATUS_TRANSITIONS.items()
+            if target in targets]
+
+
+def transition_order(order_id, target, user):
+    """
+    Change the status of an order to ``target``.
+
+    Staff users may change any order, other users only orders they received
+    as business user. Returns True if the status was changed and False if
+    the order already had the target status.
+
+    Raises:
+        Order.DoesNotExist: If the order does not exist
+        PermissionDenied: If the user may not change the order
+        Conflict: If the transition is not allowed from the current status
+    """
+    orders = Order.objects.filter(pk=order_id)
+    if not (user.is_staff or user.is_superuser):
+        orders = orders.filter(business_user=user)
+    sources = get_source_statuses(target)
+
+    with transaction.atomic():
+        # Lock the row so the status read here is the one the UPDATE replaces
+        row = (orders.filter(status__in=sources).select_for_update()
+               .values_list('status', 'business_user_id').first())
+        if row is not None:
+            Order.objects.filter(pk=order_id).update(
+                status=target, updated_at=timezone.now())
+            source, business_user_id = row
+            BusinessOrderStats.apply(business_user_id, {source: -1, target: 1})
+            return True
+
+    current = check_transition_access(order_id, user)
+    if current == target:
+        return False
+    raise Conflict(
+        f"Cannot change the status from '{current}' to '{target}'.")
+
+
+def check_transition_access(order_id, user):
+    """
+    Return the current status of an order the user may change.
+
+    Raises Order.DoesNotExist or PermissionDenied otherwise.
+    """
+    row = (Order.objects.filter(pk=order_id)
+           .values_list('status', 'business_user_id').first())
+    if row is None:
+        raise Order.DoesNotExist()
+    current, business_user_id = row
+    if not (user.is_staff or user.is_superuser) and business_user_id != user.pk:
+        raise PermissionDenied(
+            'You do not have permission to perform this action.')
+    return current
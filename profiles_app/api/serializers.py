@@ -1,6 +1,10 @@
 from rest_framework import serializers
 from ..models import Profile
 from django.contrib.auth.models import User
+from core.fields import Base64OrFileImageField
+from core.image_variants import get_variant_urls
+from core.serializers import SparseFieldsetSerializerMixin
+from reviews_app.models import BusinessRatingSummary
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -12,18 +16,21 @@ class UserSerializer(serializers.ModelSerializer):
         fields = ['id', 'username', 'email', 'first_name', 'last_name']
 
 
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Profile model.
 
     Handles validation and serialization of user profile data including
     custom validation for email, names, and other profile fields.
     Enforces required fields and read-only field restrictions.
+    Accepts ``fields`` to serialize only some of the fields.
     """
     user = serializers.SerializerMethodField()
     email = serializers.EmailField(source='user.email', read_only=True)
     username = serializers.CharField(source='user.username', read_only=True)
     uploaded_at = serializers.DateTimeField(source='created_at', read_only=True)
+    image_variants = serializers.SerializerMethodField()
+    rating = serializers.SerializerMethodField()
 
     class Meta:
         model = Profile
@@ -34,11 +41,13 @@ class ProfileSerializer(serializers.ModelSerializer):
             'first_name',
             'last_name',
             'file',
+            'image_variants',
             'location',
             'tel',
             'description',
             'working_hours',
             'type',
+            'rating',
             'email',
             'created_at',
             'updated_at',
@@ -47,15 +56,30 @@ class ProfileSerializer(serializers.ModelSerializer):
             'id',
             'user',
             'type',
+            'rating',
             'created_at',
             'updated_at',
             'username',
             'email',
             'uploaded_at']
+        # Model fields read by the method fields, see SparseFieldsetMixin
+        sparse_field_sources = {
+            'user': ['user_id'],
+            'image_variants': ['file', 'variants_ready'],
+            'rating': ['user__rating_summary'],
+        }
 
     def get_user(self, obj):
         """Return the user ID instead of the full user object."""
-        return obj.user.id
+        return obj.user_id
+
+    def get_image_variants(self, obj):
+        """Return the URLs of the resized variants of the image by width."""
+        return get_variant_urls(obj, self.context.get('request'))
+
+    def get_rating(self, obj):
+        """Return the review count, average and histogram of the user."""
+        return BusinessRatingSummary.for_user(obj.user).as_dict()
 
     def validate_first_name(self, value):
         """
@@ -126,7 +150,8 @@ class ProfileSerializer(serializers.ModelSerializer):
             'working_hours']
 
         for field in string_fields:
-            if data.get(field) is None:
+            # Fields left out by a sparse fieldset stay absent
+            if field in data and data[field] is None:
                 data[field] = ''
 
         return data
@@ -137,6 +162,8 @@ class ProfileUpdateSerializer(serializers.ModelSerializer):
     Serializer for updating Profile.
     """
     email = serializers.EmailField(required=False)
+    file = Base64OrFileImageField(
+        required=False, allow_null=True, filename='profile_image')
 
     class Meta:
         model = Profile
@@ -172,14 +199,14 @@ class ProfileUpdateSerializer(serializers.ModelSerializer):
         """Update profile and user email."""
         email = validated_data.pop('email', None)
 
-        # Update profile fields
+        # Update profile fields, only the changed columns are written
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
+        instance.save(update_fields=[*validated_data, 'updated_at'])
 
         # Update user email if provided
         if email:
             instance.user.email = email
-            instance.user.save()
+            instance.user.save(update_fields=['email'])
 
         return instance
@@ -8,6 +8,8 @@ urlpatterns = [
         views.ProfileDetailView.as_view(),
         name='profile-detail'),
     # GET/PATCH /api/profile/{pk}/
+    path('batch/', views.ProfileBatchView.as_view(), name='profile-batch'),
+    # GET /api/profile/batch/?ids=1,2,3
 
     # For /api/profiles/ endpoints
     path('', views.ProfileView.as_view(), name='profile-root'),  # Root endpoint
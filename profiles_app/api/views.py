@@ -2,12 +2,33 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework.generics import ListAPIView, RetrieveUpdateAPIView
-from django.contrib.auth.models import User
+from rest_framework.generics import GenericAPIView, ListAPIView, RetrieveUpdateAPIView
+from django.conf import settings
+from django.urls import reverse
+from core.batch import BatchLookupMixin
+from core.conditional import ConditionalGetMixin
+from core.pagination import CursorPaginationMixin, KeysetPagination
+from core.serializers import SparseFieldsetMixin
+from reviews_app.models import BusinessRatingSummary
+from ..cache import cache_profile, get_cached_profile
 from ..models import Profile
 from .serializers import ProfileSerializer, ProfileUpdateSerializer
 
 
+def get_own_profile(request):
+    """
+    Return the profile of the authenticated user, read from the database.
+
+    ``request.user.profile`` may come from the token cache and lag behind
+    changes made by other workers, it is only meant for role checks.
+
+    Raises:
+        Profile.DoesNotExist: If the user has no profile
+    """
+    return (Profile.objects.select_related('user', 'user__rating_summary')
+            .get(user_id=request.user.pk))
+
+
 class ProfileView(APIView):
     """
     API endpoint to retrieve and update the authenticated user's profile.
@@ -28,7 +49,7 @@ class ProfileView(APIView):
             Response: Profile data or error message
         """
         try:
-            profile = request.user.profile
+            profile = get_own_profile(request)
             serializer = ProfileSerializer(profile)
             return Response(serializer.data, status=status.HTTP_200_OK)
         except Profile.DoesNotExist:
@@ -46,7 +67,7 @@ class ProfileView(APIView):
             Response: Updated profile data or validation errors
         """
         try:
-            profile = request.user.profile
+            profile = get_own_profile(request)
             return self._update_profile(profile, request.data)
         except Profile.DoesNotExist:
             return Response({'detail': 'Profile not found.'},
@@ -63,33 +84,92 @@ class ProfileView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class BusinessProfileListView(ListAPIView):
+class ProfileCursorPagination(KeysetPagination):
+    """Keyset pagination for profile lists, opt-in via ``?cursor=``."""
+    orderings = ('created_at', '-created_at')
+
+
+class ProfileListMixin(SparseFieldsetMixin, CursorPaginationMixin):
+    """
+    Shared options of the profile lists.
+
+    Requests with a ``cursor`` parameter are keyset paginated, ``fields``
+    limits the serialized fields and the loaded columns (e.g.
+    ``?fields=user,username,file``).
+    """
+    serializer_class = ProfileSerializer
+    pagination_class = None  # Disable pagination
+    cursor_pagination_class = ProfileCursorPagination
+    # The cursor of the keyset pagination reads created_at
+    sparse_required_fields = ('created_at',)
+
+
+class BusinessProfileListView(ProfileListMixin, ListAPIView):
     """
     API endpoint to list all business profiles.
 
     Returns a list of all profiles with type='business'.
     Requires authentication.
     """
-    serializer_class = ProfileSerializer
     permission_classes = [IsAuthenticated]
-    queryset = Profile.objects.filter(type='business').select_related('user')
-    pagination_class = None  # Disable pagination
+    queryset = Profile.objects.filter(type='business').select_related('user', 'user__rating_summary')
 
 
-class CustomerProfileListView(ListAPIView):
+class CustomerProfileListView(ProfileListMixin, ListAPIView):
     """
     API endpoint to list all customer profiles.
 
     Returns a list of all profiles with type='customer'.
     Requires authentication.
     """
-    serializer_class = ProfileSerializer
     permission_classes = [IsAuthenticated]
-    queryset = Profile.objects.filter(type='customer').select_related('user')
-    pagination_class = None  # Disable pagination
+    queryset = Profile.objects.filter(type='customer').select_related('user', 'user__rating_summary')
+
+
+class ProfileByUserMixin:
+    """
+    Resolve profiles by the user ID in the URL.
 
+    The profile, its user and rating summary are read with one query.
+    Serialized profiles are kept in the per-process profile cache, so
+    repeated reads of the same profile do not touch the database.
+    """
+    user_id_url_kwarg = 'pk'
 
-class ProfileDetailView(RetrieveUpdateAPIView):
+    def get_object(self):
+        """Get profile by user ID from URL parameter."""
+        return (Profile.objects
+                .select_related('user', 'user__rating_summary')
+                .filter(user_id=self.kwargs.get(self.user_id_url_kwarg))
+                .first())
+
+    def get_cached_profile(self):
+        """Return the cached profile entry of the requested user or None."""
+        return get_cached_profile(
+            self.kwargs.get(self.user_id_url_kwarg), self.request)
+
+    def retrieve_profile(self, request):
+        """Return the profile from the cache or the database."""
+        entry = self.get_cached_profile()
+        if entry is None:
+            profile = self.get_object()
+            if profile is None:
+                return Response({'detail': 'Profile not found.'},
+                                status=status.HTTP_404_NOT_FOUND)
+            entry = cache_profile(
+                profile.user_id, request, self.get_serializer(profile).data,
+                self._get_profile_last_modified(profile))
+        return Response(entry.data)
+
+    def _get_profile_last_modified(self, profile):
+        """Return the newest timestamp of a profile and its rating summary."""
+        summary = BusinessRatingSummary.for_user(profile.user)
+        return max(value for value in (profile.updated_at, summary.updated_at)
+                   if value is not None)
+
+
+class ProfileDetailView(ProfileByUserMixin, ConditionalGetMixin,
+                        RetrieveUpdateAPIView):
     """
     API endpoint to retrieve and update a specific profile by ID.
 
@@ -98,31 +178,28 @@ class ProfileDetailView(RetrieveUpdateAPIView):
 
     Users can only modify their own profile.
     """
-    queryset = Profile.objects.all().select_related('user')
+    queryset = Profile.objects.all().select_related('user', 'user__rating_summary')
     serializer_class = ProfileSerializer
+    last_modified_fields = ('updated_at', 'user__rating_summary__updated_at')
+
+    def get_validator_queryset(self):
+        """Profiles are addressed by their user ID."""
+        return Profile.objects.filter(user_id=self.kwargs.get('pk'))
+
+    def get_last_modified(self):
+        """Use the timestamp of a cached profile without a query."""
+        entry = self.get_cached_profile()
+        if entry is not None:
+            return entry.last_modified
+        return super().get_last_modified()
 
     def get_permissions(self):
         """Require authentication for all operations."""
         return [IsAuthenticated()]
 
-    def get_object(self):
-        """Get profile by user ID from URL parameter."""
-        user_id = self.kwargs.get('pk')
-        try:
-            user = User.objects.get(id=user_id)
-            return user.profile
-        except (User.DoesNotExist, Profile.DoesNotExist):
-            return None
-
-    def get(self, request, *args, **kwargs):
+    def retrieve(self, request, *args, **kwargs):
         """Retrieve profile by user ID."""
-        profile = self.get_object()
-        if profile is None:
-            return Response({'detail': 'Profile not found.'},
-                            status=status.HTTP_404_NOT_FOUND)
-
-        serializer = self.get_serializer(profile)
-        return Response(serializer.data)
+        return self.retrieve_profile(request)
 
     def patch(self, request, *args, **kwargs):
         """Update profile (only own profile)."""
@@ -151,7 +228,7 @@ class ProfileDetailView(RetrieveUpdateAPIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class ProfileByUserIdView(RetrieveUpdateAPIView):
+class ProfileByUserIdView(ProfileByUserMixin, RetrieveUpdateAPIView):
     """
     API endpoint to retrieve and update a specific profile by user ID.
 
@@ -160,28 +237,14 @@ class ProfileByUserIdView(RetrieveUpdateAPIView):
 
     Users can only modify their own profile.
     """
-    queryset = Profile.objects.all().select_related('user')
+    queryset = Profile.objects.all().select_related('user', 'user__rating_summary')
     serializer_class = ProfileSerializer
     permission_classes = [IsAuthenticated]
-
-    def get_object(self):
-        """Get profile by user ID from URL parameter."""
-        user_id = self.kwargs.get('user_id')  # Changed from 'pk' to 'user_id'
-        try:
-            user = User.objects.get(id=user_id)
-            return user.profile
-        except (User.DoesNotExist, Profile.DoesNotExist):
-            return None
+    user_id_url_kwarg = 'user_id'
 
     def get(self, request, *args, **kwargs):
         """Retrieve profile by user ID."""
-        profile = self.get_object()
-        if profile is None:
-            return Response({'detail': 'Profile not found.'},
-                            status=status.HTTP_404_NOT_FOUND)
-
-        serializer = self.get_serializer(profile)
-        return Response(serializer.data)
+        return self.retrieve_profile(request)
 
     def patch(self, request, *args, **kwargs):
         """Update profile (only own profile)."""
@@ -210,44 +273,79 @@ class ProfileByUserIdView(RetrieveUpdateAPIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class PublicProfilesView(ListAPIView):
+class ProfileBatchView(BatchLookupMixin, GenericAPIView):
     """
-    Public list of all profiles (no authentication required).
+    Retrieve several profiles at once via ``?ids=1,2,3`` (user IDs).
     """
+    queryset = Profile.objects.all().select_related('user', 'user__rating_summary')
     serializer_class = ProfileSerializer
-    permission_classes = [AllowAny]
-    pagination_class = None
+    permission_classes = [IsAuthenticated]
+    batch_lookup_field = 'user_id'
 
-    def get_queryset(self):
-        """Get all profiles."""
-        return Profile.objects.all().select_related('user')
+
+class PublicProfilesView(ProfileListMixin, ListAPIView):
+    """
+    Public list of all profiles (no authentication required).
+    """
+    permission_classes = [AllowAny]
+    queryset = Profile.objects.all().select_related('user', 'user__rating_summary')
 
 
 class MeView(APIView):
     """
     Get current user's profile with orders (for business users).
+
+    Business users get their most recent ``ME_RECENT_ORDERS`` orders, a
+    link to the following orders in the order list and the number of
+    orders per status, so the cost of the response does not grow with the
+    number of orders. ``?include=orders`` embeds all orders instead.
     """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         """Get current user's profile data."""
         try:
-            profile = request.user.profile
+            profile = get_own_profile(request)
             serializer = ProfileSerializer(profile)
             data = serializer.data
 
             # Add orders if business user
             if profile.type == 'business':
-                from orders_app.models import Order
-                from orders_app.api.serializers import OrderSerializer
-                orders = (Order.objects
-                          .filter(offer_detail__offer__owner=request.user)
-                          .select_related('customer',
-                                          'offer_detail__offer__owner')
-                          .prefetch_related('offer_detail'))
-                data['orders'] = OrderSerializer(orders, many=True).data
+                data.update(self._get_order_data(request))
 
             return Response(data, status=status.HTTP_200_OK)
         except Profile.DoesNotExist:
             return Response({'detail': 'Profile not found.'},
                             status=status.HTTP_404_NOT_FOUND)
+
+    def _get_order_data(self, request):
+        """Return the embedded orders of a business user."""
+        from orders_app.models import BusinessOrderStats, Order
+        from orders_app.api.readers import (
+            ORDER_COLUMNS, serialize_order_row, serialize_orders
+        )
+        from orders_app.api.views import OrderCursorPagination
+
+        orders = Order.objects.filter(business_user=request.user)
+        include = request.query_params.get('include', '').split(',')
+        if 'orders' in include:
+            return {'orders': serialize_orders(orders)}
+
+        limit = getattr(settings, 'ME_RECENT_ORDERS', 10)
+        rows = list(orders.order_by('-created_at', '-pk')
+                    .values(*ORDER_COLUMNS)[:limit + 1])
+        next_link = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            cursor = OrderCursorPagination().get_cursor_after(rows[-1])
+            next_link = request.build_absolute_uri(
+                f"{reverse('order-list-create')}?role=business&cursor={cursor}")
+
+        statuses = [value for value, _ in Order.STATUS_CHOICES]
+        counts = (BusinessOrderStats.objects.filter(pk=request.user.pk)
+                  .values(*statuses).first())
+        return {
+            'orders': [serialize_order_row(row) for row in rows],
+            'orders_next': next_link,
+            'order_counts': counts or dict.fromkeys(statuses, 0),
+        }
@@ -0,0 +1,53 @@
+"""
+Per-process cache of serialized profiles for the profile detail endpoints.
+
+Entries are keyed by user ID and hold the response payload together with
+its Last-Modified timestamp, so a hit answers a GET (including conditional
+requests) without touching the database. Entries are dropped when the
+profile, its user or the rating summary of the user changes, see
+profiles_app.signals. Other worker processes only notice such changes
+after ``PROFILE_CACHE_TTL`` seconds.
+"""
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import transaction
+from core.lru import TTLLRUCache
+
+CachedProfile = namedtuple('CachedProfile', ['base_url', 'data', 'last_modified'])
+
+_cache = None
+
+
+def get_profile_cache():
+    """Return the cache of this process, created on first use."""
+    global _cache
+    if _cache is None:
+        _cache = TTLLRUCache(
+            maxsize=getattr(settings, 'PROFILE_CACHE_MAX_ENTRIES', 1024),
+            ttl=getattr(settings, 'PROFILE_CACHE_TTL', 30))
+    return _cache
+
+
+def get_cached_profile(user_id, request):
+    """Return the cached profile of a user or None."""
+    entry = get_profile_cache().get(user_id)
+    # File URLs are absolute, entries are only valid for the same host
+    if entry is None or entry.base_url != request.build_absolute_uri('/'):
+        return None
+    return entry
+
+
+def cache_profile(user_id, request, data, last_modified):
+    """Store the payload of a profile and return the entry."""
+    entry = CachedProfile(request.build_absolute_uri('/'), data, last_modified)
+    get_profile_cache().set(user_id, entry)
+    return entry
+
+
+def invalidate_profile(user_id):
+    """Drop the cached profile of a user now and after the commit."""
+    cache = get_profile_cache()
+    cache.delete(user_id)
+    # A concurrent read may cache the old row until the write is committed
+    transaction.on_commit(lambda: cache.delete(user_id))
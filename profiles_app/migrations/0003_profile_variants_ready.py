@@ -0,0 +1,34 @@
+# Generated by Django 5.2.3 on 2026-10-18 06:53
+
+from django.core.files.storage import default_storage
+from django.db import migrations, models
+from core.image_variants import get_variant_names, get_widths
+
+
+def backfill_variants_ready(apps, schema_editor):
+    """Mark the images whose variants were already generated."""
+    Profile = apps.get_model('profiles_app', 'Profile')
+    width = get_widths()[-1]
+    names = (Profile.objects.exclude(file='').exclude(file__isnull=True)
+             .values_list('file', flat=True).distinct())
+    ready = [name for name in names
+             if default_storage.exists(get_variant_names(name, width)['webp'])]
+    for start in range(0, len(ready), 500):
+        Profile.objects.filter(file__in=ready[start:start + 500]).update(
+            variants_ready=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles_app', '0002_profile_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='variants_ready',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(backfill_variants_ready, migrations.RunPython.noop),
+    ]
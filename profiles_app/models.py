@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import User
+from core.image_variants import clear_variants_ready
 
 
 class Profile(models.Model):
@@ -14,6 +15,8 @@ class Profile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     type = models.CharField(max_length=20, choices=TYPE_CHOICES)
     file = models.ImageField(upload_to='profiles/', blank=True, null=True)
+    # Set once the resized variants of the image exist
+    variants_ready = models.BooleanField(default=False)
     first_name = models.CharField(max_length=150, blank=True, default='')
     last_name = models.CharField(max_length=150, blank=True, default='')
     location = models.CharField(max_length=200, blank=True, null=True)
@@ -24,8 +27,31 @@ class Profile(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Image name as loaded, used to clean up the variants of replaced images
+    _loaded_file = None
+
     class Meta:
         db_table = 'profiles_profile'
+        indexes = [
+            models.Index(fields=['type', 'created_at'],
+                         name='profiles_type_created_idx'),
+            models.Index(fields=['created_at'],
+                         name='profiles_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.type}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded image name to detect replaced images."""
+        instance = super().from_db(db, field_names, values)
+        if 'file' in instance.__dict__:
+            instance._loaded_file = instance.__dict__['file'] or ''
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Save the row, a new image has no variants yet."""
+        kwargs['update_fields'] = clear_variants_ready(
+            self, kwargs.get('update_fields'))
+        super().save(*args, **kwargs)
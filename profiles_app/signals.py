@@ -0,0 +1,59 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from core.image_variants import handle_deleted_image, handle_saved_image
+from .cache import get_profile_cache, invalidate_profile
+from .models import Profile
+
+
+@receiver(post_save, sender=Profile)
+def generate_profile_image_variants(sender, instance, update_fields=None, **kwargs):
+    """Create thumbnails of a new profile image in the background."""
+    user_id = instance.user_id
+    name = instance.file.name if instance.file else ''
+    handle_saved_image(
+        instance, update_fields,
+        on_done=lambda: profile_image_variants_done(user_id, name))
+
+
+def profile_image_variants_done(user_id, name):
+    """
+    Mark the variants of the profile image as ready.
+
+    Bumping ``updated_at`` changes the validators of the profile response,
+    which lists the variants. Rows whose image was replaced meanwhile are
+    skipped.
+    """
+    if Profile.objects.filter(user_id=user_id, file=name, variants_ready=False).update(
+            variants_ready=True, updated_at=timezone.now()):
+        get_profile_cache().delete(user_id)
+
+
+@receiver(post_delete, sender=Profile)
+def delete_profile_image_variants(sender, instance, **kwargs):
+    """Remove the thumbnails of a deleted profile."""
+    handle_deleted_image(instance)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_cached_profile(sender, instance, **kwargs):
+    """Drop the cached payload of a changed profile."""
+    invalidate_profile(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_profile_for_user(sender, instance, update_fields=None, **kwargs):
+    """Profiles embed username and email of their user."""
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    invalidate_profile(instance.pk)
+
+
+# Profiles embed the rating summary of their user
+@receiver(post_save, sender='reviews_app.Review')
+@receiver(post_delete, sender='reviews_app.Review')
+def invalidate_cached_profile_for_review(sender, instance, **kwargs):
+    """Drop the cached profile of a reviewed business user."""
+    invalidate_profile(instance.business_user_id)
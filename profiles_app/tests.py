@@ -0,0 +1,103 @@
+import shutil
+import tempfile
+from io import BytesIO
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+from rest_framework.test import APITestCase
+from orders_app.tests import create_user
+from .api.serializers import ProfileSerializer
+from .models import Profile
+
+
+class PublicProfilesSparseFieldsTests(APITestCase):
+    """``?fields=`` narrows the columns the public profile list loads."""
+
+    def setUp(self):
+        cache.clear()
+        create_user('business', 'business')
+        create_user('customer', 'customer')
+
+    def get_profile_select(self, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/public-profiles/', params)
+        self.assertEqual(response.status_code, 200)
+        statements = [query['sql'] for query in queries
+                      if 'FROM "profiles_profile"' in query['sql']]
+        self.assertEqual(len(statements), 1)
+        return response, statements[0]
+
+    def assert_narrowed(self, statement):
+        columns = statement.split(' FROM ')[0]
+        self.assertIn('"auth_user"."username"', columns)
+        self.assertIn('"profiles_profile"."created_at"', columns)
+        self.assertNotIn('"profiles_profile"."description"', columns)
+        self.assertNotIn('"profiles_profile"."file"', columns)
+        self.assertNotIn('"auth_user"."password"', columns)
+        self.assertNotIn('ratingsummary', statement)
+
+    def test_fields_narrow_the_select(self):
+        response, statement = self.get_profile_select({'fields': 'user,username'})
+        self.assert_narrowed(statement)
+        self.assertEqual(set(response.data[0]), {'user', 'username'})
+
+    def test_fields_narrow_the_select_in_cursor_mode(self):
+        response, statement = self.get_profile_select(
+            {'fields': 'user,username', 'cursor': ''})
+        self.assert_narrowed(statement)
+        self.assertEqual(set(response.data['results'][0]), {'user', 'username'})
+
+    def test_without_fields_the_rating_is_joined(self):
+        _, statement = self.get_profile_select({})
+        self.assertIn('"profiles_profile"."description"', statement)
+        self.assertIn('ratingsummary', statement)
+
+
+@override_settings(IMAGE_VARIANTS_ASYNC=False, IMAGE_VARIANT_WIDTHS=(16, 32))
+class ProfileImageVariantsTests(APITestCase):
+    """The variants listed in a profile follow its ``variants_ready`` column."""
+
+    def setUp(self):
+        cache.clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user, _ = create_user('business', 'business')
+
+    def upload(self, name):
+        content = BytesIO()
+        Image.new('RGB', (64, 48), 'red').save(content, 'PNG')
+        profile = Profile.objects.get(user=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.file = SimpleUploadedFile(name, content.getvalue())
+            profile.save(update_fields=['file', 'updated_at'])
+        return profile
+
+    def test_variants_are_listed_once_ready(self):
+        self.upload('avatar.png')
+        profile = Profile.objects.get(user=self.user)
+        self.assertTrue(profile.variants_ready)
+
+        with patch.object(default_storage, 'exists') as exists:
+            variants = ProfileSerializer(profile).data['image_variants']
+        exists.assert_not_called()
+        self.assertEqual(set(variants), {'16', '32'})
+
+    def test_new_image_clears_the_flag(self):
+        profile = self.upload('avatar.png')
+        profile.refresh_from_db()
+
+        profile.file = SimpleUploadedFile('other.png', b'')
+        profile.save(update_fields=['file', 'updated_at'])
+
+        profile.refresh_from_db()
+        self.assertFalse(profile.variants_ready)
+        self.assertEqual(ProfileSerializer(profile).data['image_variants'], {})
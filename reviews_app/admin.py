@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Review
+from .models import BusinessRatingSummary, Review
 
 
 @admin.register(Review)
@@ -7,3 +7,11 @@ class ReviewAdmin(admin.ModelAdmin):
     list_display = ['id', 'reviewer', 'business_user', 'rating', 'created_at']
     list_filter = ['rating', 'created_at']
     search_fields = ['reviewer__username', 'business_user__username', 'description']
+
+
+@admin.register(BusinessRatingSummary)
+class BusinessRatingSummaryAdmin(admin.ModelAdmin):
+    list_display = ['business_user', 'count', 'total', 'updated_at']
+    readonly_fields = ['business_user', 'count', 'total', 'rating_1', 'rating_2',
+                       'rating_3', 'rating_4', 'rating_5', 'updated_at']
+    search_fields = ['business_user__username']
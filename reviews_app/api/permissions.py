@@ -1,4 +1,5 @@
 from rest_framework import permissions
+from core.authentication import get_profile_type
 
 
 class IsAuthorOrReadOnly(permissions.BasePermission):
@@ -28,11 +29,5 @@ class IsCustomerUser(permissions.BasePermission):
         if not request.user or not request.user.is_authenticated:
             return False
 
-        # For business users, return False to trigger 403 (Permission Denied)
-        if hasattr(request.user, 'profile') and request.user.profile.type == 'business':
-            return False
-
-        # Only customer users can create reviews
-        return hasattr(
-            request.user,
-            'profile') and request.user.profile.type == 'customer'
+        # Only customer users can create reviews, business users get 403
+        return get_profile_type(request.user) == 'customer'
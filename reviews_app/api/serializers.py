@@ -1,6 +1,8 @@
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 from ..models import Review
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
 
 
 class ReviewSerializer(serializers.ModelSerializer):
@@ -29,16 +31,19 @@ class ReviewSerializer(serializers.ModelSerializer):
 
     def get_reviewer(self, obj):
         """Return the reviewer's ID."""
-        return obj.reviewer.id
+        return obj.reviewer_id
 
     def get_business_user(self, obj):
         """Return the business user's ID."""
-        return obj.business_user.id
+        return obj.business_user_id
 
 
 class ReviewCreateSerializer(serializers.ModelSerializer):
     """
     Serializer for creating Review.
+
+    The business user and its profile are read with one joined query,
+    duplicate reviews are detected by the unique constraint on insert.
     """
     business_user = serializers.IntegerField()
 
@@ -47,41 +52,37 @@ class ReviewCreateSerializer(serializers.ModelSerializer):
         fields = ['business_user', 'rating', 'description']
 
     def validate_business_user(self, value):
-        """Validate business user."""
-        try:
-            user = User.objects.get(id=value)
-            if not hasattr(user, 'profile') or user.profile.type != 'business':
-                raise serializers.ValidationError("User is not a business user.")
-            return value
-        except User.DoesNotExist:
+        """Validate business user and keep it for ``create``."""
+        user = (User.objects.select_related('profile')
+                .filter(id=value).first())
+        if user is None:
             raise serializers.ValidationError("Business user not found.")
+        if not hasattr(user, 'profile') or user.profile.type != 'business':
+            raise serializers.ValidationError("User is not a business user.")
+        self._business_user = user
+        return value
 
     def validate(self, data):
         """Validate review data."""
-        business_user = User.objects.get(id=data['business_user'])
-        reviewer = self.context['request'].user
-
         # Check if reviewer is trying to review themselves
-        if business_user == reviewer:
+        if data['business_user'] == self.context['request'].user.id:
             raise serializers.ValidationError("You cannot review yourself.")
-
-        # Check if review already exists
-        if Review.objects.filter(
-                reviewer=reviewer,
-                business_user=business_user).exists():
-            raise serializers.ValidationError(
-                "You have already reviewed this business user.")
-
         return data
 
     def create(self, validated_data):
-        """Create new review."""
-        business_user = User.objects.get(id=validated_data.pop('business_user'))
-        return Review.objects.create(
-            reviewer=self.context['request'].user,
-            business_user=business_user,
-            **validated_data
-        )
+        """Create new review, one per reviewer and business user."""
+        validated_data.pop('business_user')
+        try:
+            with transaction.atomic():
+                return Review.objects.create(
+                    reviewer=self.context['request'].user,
+                    business_user=self._business_user,
+                    **validated_data
+                )
+        except IntegrityError:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    "You have already reviewed this business user."]})
 
 
 class ReviewUpdateSerializer(serializers.ModelSerializer):
@@ -1,9 +1,13 @@
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import (
     ListCreateAPIView, RetrieveUpdateDestroyAPIView
 )
+from core.conditional import ConditionalGetMixin
+from core.idempotency import IdempotentCreateMixin
+from core.pagination import CursorPaginationMixin, KeysetPagination
 from ..models import Review
 from .serializers import (
     ReviewSerializer, ReviewCreateSerializer, ReviewUpdateSerializer
@@ -11,29 +15,70 @@ from .serializers import (
 from .permissions import IsAuthorOrReadOnly, IsCustomerUser
 
 
-class ReviewListCreateView(ListCreateAPIView):
+class ReviewCursorPagination(KeysetPagination):
+    """Keyset pagination for the review list, opt-in via ``?cursor=``."""
+    orderings = ('-created_at', 'created_at', '-rating', 'rating')
+
+
+class ReviewListCreateView(IdempotentCreateMixin, CursorPaginationMixin,
+                           ListCreateAPIView):
     """
     List all reviews or create a new review.
+
+    ``business_user_id``, ``reviewer_id``, ``rating`` and ``min_rating``
+    filter the list, ``ordering`` sorts it by ``created_at`` or ``rating``.
+    The business user filters are backed by the (business_user, created_at)
+    and (business_user, rating) indexes. Requests with a ``cursor``
+    parameter are keyset paginated. Creation honors the Idempotency-Key
+    header.
     """
     queryset = Review.objects.all().select_related('reviewer', 'business_user')
     pagination_class = None  # Disable pagination
-    
+    cursor_pagination_class = ReviewCursorPagination
+    idempotency_scope = 'reviews'
+
     def get_queryset(self):
         """Return filtered queryset."""
         queryset = Review.objects.all().select_related('reviewer', 'business_user')
-        
+        params = self.request.query_params
+
         # Filter by business_user_id
-        business_user_id = self.request.query_params.get('business_user_id')
+        business_user_id = params.get('business_user_id')
         if business_user_id:
             queryset = queryset.filter(business_user_id=business_user_id)
-        
+
         # Filter by reviewer_id
-        reviewer_id = self.request.query_params.get('reviewer_id')
+        reviewer_id = params.get('reviewer_id')
         if reviewer_id:
             queryset = queryset.filter(reviewer_id=reviewer_id)
-        
+
+        # Filter by exact or minimum rating
+        for param, lookup in (('rating', 'rating'), ('min_rating', 'rating__gte')):
+            value = params.get(param)
+            if value:
+                queryset = queryset.filter(**{lookup: self._parse_rating(param, value)})
+
+        ordering = params.get('ordering')
+        if ordering:
+            orderings = ReviewCursorPagination.orderings
+            if ordering not in orderings:
+                raise ValidationError(
+                    {'ordering': f"Must be one of: {', '.join(orderings)}."})
+            descending = ordering.startswith('-')
+            queryset = queryset.order_by(ordering, '-pk' if descending else 'pk')
+
         return queryset
-    
+
+    def _parse_rating(self, param, value):
+        """Parse a rating between 1 and 5."""
+        try:
+            rating = int(value)
+        except ValueError:
+            rating = None
+        if rating is None or not 1 <= rating <= 5:
+            raise ValidationError({param: 'Must be an integer between 1 and 5.'})
+        return rating
+
     def get_serializer_class(self):
         """Return appropriate serializer class."""
         if self.request.method == 'POST':
@@ -63,7 +108,7 @@ class ReviewListCreateView(ListCreateAPIView):
         return Response(response_serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
 
-class ReviewDetailView(RetrieveUpdateDestroyAPIView):
+class ReviewDetailView(ConditionalGetMixin, RetrieveUpdateDestroyAPIView):
     """
     Retrieve, update or delete a review.
     """
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from reviews_app.models import (
+    BusinessRatingSummary, PlatformRatingSummary, Review
+)
+
+
+class Command(BaseCommand):
+    """
+    Recalculate the per business and platform rating summaries.
+
+    Needed after reviews were changed without Review.save(), e.g. by
+    queryset updates, bulk operations or manual database edits.
+    """
+    help = 'Rebuild the rating summaries from the reviews table.'
+
+    def handle(self, *args, **options):
+        summaries = {}
+        platform = PlatformRatingSummary(pk=PlatformRatingSummary.SINGLETON_ID)
+        rows = (Review.objects.values_list('business_user_id', 'rating')
+                .annotate(count=Count('id')).order_by())
+        for business_user_id, rating, count in rows:
+            row = summaries.setdefault(
+                business_user_id,
+                BusinessRatingSummary(business_user_id=business_user_id))
+            for summary in (row, platform):
+                summary.count += count
+                summary.total += rating * count
+                field = f'rating_{rating}'
+                setattr(summary, field, getattr(summary, field) + count)
+
+        with transaction.atomic():
+            BusinessRatingSummary.objects.all().delete()
+            PlatformRatingSummary.objects.all().delete()
+            BusinessRatingSummary.objects.bulk_create(summaries.values())
+            platform.save()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt rating summaries of {len(summaries)} business users.'))
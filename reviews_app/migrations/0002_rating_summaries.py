@@ -0,0 +1,78 @@
+# Generated by Django 5.2.3 on 2026-10-18 06:07
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_rating_summaries(apps, schema_editor):
+    """Summarize the existing reviews per business user and overall."""
+    Review = apps.get_model('reviews_app', 'Review')
+    BusinessRatingSummary = apps.get_model('reviews_app', 'BusinessRatingSummary')
+    PlatformRatingSummary = apps.get_model('reviews_app', 'PlatformRatingSummary')
+
+    summaries = {}
+    platform = PlatformRatingSummary(pk=1)
+    rows = (Review.objects.values_list('business_user_id', 'rating')
+            .annotate(count=Count('id')).order_by())
+    for business_user_id, rating, count in rows:
+        row = summaries.setdefault(
+            business_user_id,
+            BusinessRatingSummary(business_user_id=business_user_id))
+        for summary in (row, platform):
+            summary.count += count
+            summary.total += rating * count
+            setattr(summary, f'rating_{rating}',
+                    getattr(summary, f'rating_{rating}') + count)
+    BusinessRatingSummary.objects.bulk_create(summaries.values())
+    if platform.count:
+        platform.save()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('reviews_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessRatingSummary',
+            fields=[
+                ('count', models.IntegerField(default=0)),
+                ('total', models.IntegerField(default=0)),
+                ('rating_1', models.IntegerField(default=0)),
+                ('rating_2', models.IntegerField(default=0)),
+                ('rating_3', models.IntegerField(default=0)),
+                ('rating_4', models.IntegerField(default=0)),
+                ('rating_5', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('business_user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating_summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'business rating summaries',
+                'db_table': 'reviews_businessratingsummary',
+            },
+        ),
+        migrations.CreateModel(
+            name='PlatformRatingSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.IntegerField(default=0)),
+                ('total', models.IntegerField(default=0)),
+                ('rating_1', models.IntegerField(default=0)),
+                ('rating_2', models.IntegerField(default=0)),
+                ('rating_3', models.IntegerField(default=0)),
+                ('rating_4', models.IntegerField(default=0)),
+                ('rating_5', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'platform rating summary',
+                'db_table': 'reviews_platformratingsummary',
+            },
+        ),
+        migrations.RunPython(backfill_rating_summaries, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,9 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
 from django.contrib.auth.models import User
+from django.core.exceptions import ObjectDoesNotExist
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.utils import timezone
 
 
 class Review(models.Model):
@@ -23,11 +26,206 @@ class Review(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Business user and rating as loaded, used to update the summaries
+    _loaded_rating = None
+
     class Meta:
         db_table = 'reviews_review'
         ordering = ['-created_at']
         # One review per customer-business pair
         unique_together = ['reviewer', 'business_user']
+        indexes = [
+            models.Index(fields=['business_user', 'created_at'],
+                         name='reviews_business_created_idx'),
+            models.Index(fields=['business_user', 'rating'],
+                         name='reviews_business_rating_idx'),
+            models.Index(fields=['reviewer', 'created_at'],
+                         name='reviews_reviewer_created_idx'),
+        ]
 
     def __str__(self):
         return f"Review by {self.reviewer.username} for {self.business_user.username} ({self.rating}/5)"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded rating to detect changes on save."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_rating = (instance.__dict__.get('business_user_id'),
+                                   instance.__dict__.get('rating'))
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Save the review and keep the rating summaries current."""
+        adding = self._state.adding
+        update_fields = kwargs.get('update_fields')
+        tracks_rating = (update_fields is None
+                         or bool({'rating', 'business_user'} & set(update_fields)))
+        previous = None if adding else self._loaded_rating
+        if not adding and tracks_rating and (previous is None or None in previous):
+            previous = (Review.objects.filter(pk=self.pk)
+                        .values_list('business_user_id', 'rating').first())
+
+        current = (self.business_user_id, self.rating)
+        # No savepoint of its own, a failure rolls back the caller's block
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
+            if adding:
+                apply_rating_changes([(current, 1)])
+            elif tracks_rating and previous != current:
+                apply_rating_changes([(previous, -1), (current, 1)])
+        if tracks_rating:
+            self._loaded_rating = current
+
+
+class RatingSummary(models.Model):
+    """
+    Number of reviews, sum of their ratings and a 1-5 star histogram.
+
+    The counters are updated with F() expressions in the transaction that
+    creates, changes or deletes a review, so reading them is a single row
+    lookup. Writes that bypass ``Review.save`` (queryset updates, bulk
+    operations) must be followed by the ``rebuild_rating_summaries``
+    command.
+    """
+    RATINGS = (1, 2, 3, 4, 5)
+
+    count = models.IntegerField(default=0)
+    total = models.IntegerField(default=0)
+    rating_1 = models.IntegerField(default=0)
+    rating_2 = models.IntegerField(default=0)
+    rating_3 = models.IntegerField(default=0)
+    rating_4 = models.IntegerField(default=0)
+    rating_5 = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+
+    @property
+    def average(self):
+        """Return the average rating or None without reviews."""
+        if not self.count:
+            return None
+        return round(self.total / self.count, 1)
+
+    def as_dict(self):
+        """Return the representation used in API responses."""
+        return {
+            'count': self.count,
+            'average': self.average,
+            'distribution': {
+                str(rating): getattr(self, f'rating_{rating}')
+                for rating in self.RATINGS},
+        }
+
+    @classmethod
+    def apply(cls, rows, changes):
+        """
+        Add ``changes`` ({rating: delta}) to the counters of ``rows``.
+
+        Returns False if no row was updated.
+        """
+        values = {'updated_at': timezone.now(),
+                  'count': F('count') + sum(changes.values()),
+                  'total': F('total') + sum(r * d for r, d in changes.items())}
+        for rating, delta in changes.items():
+            values[f'rating_{rating}'] = F(f'rating_{rating}') + delta
+        return bool(rows.update(**values))
+
+
+class BusinessRatingSummary(RatingSummary):
+    """
+    Rating summary of the reviews a business user received.
+    """
+    business_user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='rating_summary')
+
+    class Meta:
+        db_table = 'reviews_businessratingsummary'
+        verbose_name_plural = 'business rating summaries'
+
+    def __str__(self):
+        return f"Rating summary of user {self.business_user_id}"
+
+    @classmethod
+    def for_user(cls, user):
+        """
+        Return the summary of a user, an empty one if there is none.
+
+        Reads ``user.rating_summary``, querysets should select it with
+        ``select_related('...__rating_summary')``.
+        """
+        try:
+            summary = user.rating_summary
+        except ObjectDoesNotExist:
+            summary = None
+        return summary or cls(business_user_id=user.pk)
+
+
+class PlatformRatingSummary(RatingSummary):
+    """
+    Rating summary of all reviews, a single row with ``SINGLETON_ID``.
+    """
+    SINGLETON_ID = 1
+
+    class Meta:
+        db_table = 'reviews_platformratingsummary'
+        verbose_name_plural = 'platform rating summary'
+
+    def __str__(self):
+        return "Platform rating summary"
+
+    @classmethod
+    def get(cls):
+        """Return the platform summary, an empty one if there is none."""
+        return (cls.objects.filter(pk=cls.SINGLETON_ID).first()
+                or cls(pk=cls.SINGLETON_ID))
+
+
+def apply_rating_changes(changes):
+    """
+    Update the business and platform summaries.
+
+    ``changes`` is a list of ((business_user_id, rating), delta) pairs.
+    Rows are created on the first increment, decrements never create a
+    row so deleting a business user with reviews does not recreate it.
+    """
+    per_business = {}
+    platform = {}
+    for (business_user_id, rating), delta in changes:
+        if business_user_id is None or rating is None or not delta:
+            continue
+        ratings = per_business.setdefault(business_user_id, {})
+        ratings[rating] = ratings.get(rating, 0) + delta
+        platform[rating] = platform.get(rating, 0) + delta
+
+    for business_user_id, ratings in per_business.items():
+        _apply(BusinessRatingSummary, business_user_id, ratings)
+    _apply(PlatformRatingSummary, PlatformRatingSummary.SINGLETON_ID, platform)
+
+
+def _apply(model, pk, changes):
+    """
+    Apply non-zero ``changes`` to one summary row, creating it if needed.
+
+    A missing row is inserted with the changes as its initial counters. A
+    concurrent insert of the same row rolls back to the savepoint and the
+    changes are applied to the row that won.
+    """
+    changes = {rating: delta for rating, delta in changes.items() if delta}
+    if not changes:
+        return
+    rows = model.objects.filter(pk=pk)
+    if model.apply(rows, changes) or not any(d > 0 for d in changes.values()):
+        return
+    initial = {f'rating_{rating}': delta for rating, delta in changes.items()}
+    try:
+        with transaction.atomic():
+            model.objects.create(
+                pk=pk, count=sum(changes.values()),
+                total=sum(r * d for r, d in changes.items()), **initial)
+    except IntegrityError:
+        model.apply(rows, changes)
@@ -0,0 +1,9 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from .models import Review, apply_rating_changes
+
+
+@receiver(post_delete, sender=Review)
+def update_summaries_for_deleted_review(sender, instance, **kwargs):
+    """Remove deleted reviews from the rating summaries."""
+    apply_rating_changes([((instance.business_user_id, instance.rating), -1)])
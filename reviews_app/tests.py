@@ -0,0 +1,147 @@
+from django.core.cache import cache
+from rest_framework import serializers
+from rest_framework.test import APIRequestFactory, APITestCase
+from orders_app.tests import create_user
+from .api.serializers import ReviewCreateSerializer
+from .api.views import ReviewListCreateView
+from .models import BusinessRatingSummary, PlatformRatingSummary, Review
+
+
+class ReviewCreateTests(APITestCase):
+    """Review creation resolves its users with a constant number of queries."""
+
+    def setUp(self):
+        cache.clear()
+        self.business, _ = create_user('business', 'business')
+        self.customer, self.customer_token = create_user('customer', 'customer')
+        self.request = APIRequestFactory().post('/api/reviews/')
+        self.request.user = self.customer
+
+    def create_review(self):
+        serializer = ReviewCreateSerializer(
+            data={'business_user': self.business.pk, 'rating': 4, 'description': 'Good'},
+            context={'request': self.request})
+        serializer.is_valid(raise_exception=True)
+        return serializer.save()
+
+    def test_create_budget(self):
+        # Profile lookup, review INSERT and the UPDATEs of the business and
+        # platform summaries, plus the SAVEPOINT/RELEASE of the serializer's
+        # atomic block inside the test case's transaction
+        other, _ = create_user('other', 'customer')
+        Review.objects.create(reviewer=other, business_user=self.business,
+                              rating=2, description='Fine')
+
+        with self.assertNumQueries(6) as queries:
+            review = self.create_review()
+
+        statements = [query['sql'] for query in queries.captured_queries]
+        self.assertIn('"profiles_profile"', statements[0])
+        self.assertTrue(statements[2].startswith('INSERT INTO "reviews_review"'))
+        self.assertTrue(statements[3].startswith(
+            'UPDATE "reviews_businessratingsummary"'))
+        self.assertTrue(statements[4].startswith(
+            'UPDATE "reviews_platformratingsummary"'))
+        self.assertEqual(review.business_user_id, self.business.pk)
+        self.assertEqual(review.reviewer_id, self.customer.pk)
+        self.assertEqual(BusinessRatingSummary.objects.get(pk=self.business.pk)
+                         .as_dict()['distribution'], {
+                             '1': 0, '2': 1, '3': 0, '4': 1, '5': 0})
+
+    def test_first_review_creates_the_summaries(self):
+        # The UPDATE of a missing summary is followed by an INSERT with the
+        # initial counters in a savepoint, for the business and platform
+        with self.assertNumQueries(12):
+            self.create_review()
+
+        for summary in (BusinessRatingSummary.objects.get(pk=self.business.pk),
+                        PlatformRatingSummary.get()):
+            self.assertEqual(summary.as_dict(), {
+                'count': 1, 'average': 4.0,
+                'distribution': {'1': 0, '2': 0, '3': 0, '4': 1, '5': 0}})
+
+    def test_duplicate_review_is_a_validation_error(self):
+        self.create_review()
+
+        with self.assertRaises(serializers.ValidationError):
+            self.create_review()
+        self.assertEqual(Review.objects.count(), 1)
+
+    def test_duplicate_review_returns_400(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.customer_token.key}')
+        data = {'business_user': self.business.pk, 'rating': 5, 'description': 'Great'}
+        self.assertEqual(
+            self.client.post('/api/reviews/', data, format='json').status_code, 201)
+
+        response = self.client.post('/api/reviews/', data, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {
+            'non_field_errors': ['You have already reviewed this business user.']})
+        self.assertEqual(Review.objects.count(), 1)
+
+
+class ReviewListTests(APITestCase):
+    """Filters, keyset pagination and the indexes behind the review list."""
+
+    def setUp(self):
+        cache.clear()
+        self.business, self.business_token = create_user('business', 'business')
+        other, _ = create_user('other', 'business')
+        for rating in (3, 5, 1, 4, 2):
+            customer, _ = create_user(f'customer{rating}', 'customer')
+            Review.objects.create(
+                reviewer=customer, business_user=self.business, rating=rating,
+                description=f'Rating {rating}')
+            Review.objects.create(
+                reviewer=customer, business_user=other, rating=rating,
+                description='Other business')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.business_token.key}')
+
+    def get_list(self, **params):
+        params.setdefault('business_user_id', self.business.pk)
+        return self.client.get('/api/reviews/', params)
+
+    def get_queryset(self, **params):
+        params.setdefault('business_user_id', self.business.pk)
+        view = ReviewListCreateView()
+        view.request = view.initialize_request(
+            APIRequestFactory().get('/api/reviews/', params))
+        return view.get_queryset()
+
+    def test_business_user_by_created_at_uses_index(self):
+        plan = self.get_queryset(ordering='-created_at').explain()
+        self.assertIn('reviews_business_created_idx', plan)
+
+    def test_business_user_by_rating_uses_index(self):
+        plan = self.get_queryset(ordering='-rating').explain()
+        self.assertIn('reviews_business_rating_idx', plan)
+        plan = self.get_queryset(min_rating=4).order_by('rating', 'pk').explain()
+        self.assertIn('reviews_business_rating_idx', plan)
+
+    def test_cursor_pages_follow_the_ordering(self):
+        ratings, url, params = [], '/api/reviews/', {
+            'business_user_id': self.business.pk, 'ordering': '-rating',
+            'cursor': '', 'page_size': 2}
+        pages = 0
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200, response.content)
+            data = response.json()
+            self.assertLessEqual(len(data['results']), 2)
+            ratings += [review['rating'] for review in data['results']]
+            url, params = data['next'], None
+            pages += 1
+        self.assertEqual(ratings, [5, 4, 3, 2, 1])
+        self.assertEqual(pages, 3)
+
+    def test_rating_filters(self):
+        response = self.get_list(rating=5)
+        self.assertEqual([review['rating'] for review in response.json()], [5])
+
+        response = self.get_list(min_rating=4, ordering='rating')
+        self.assertEqual([review['rating'] for review in response.json()], [4, 5])
+
+    def test_invalid_filters_return_400(self):
+        for params in ({'rating': 6}, {'min_rating': 'x'}, {'ordering': 'description'}):
+            with self.subTest(params=params):
+                self.assertEqual(self.get_list(**params).status_code, 400)